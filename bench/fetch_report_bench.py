@@ -0,0 +1,149 @@
+"""
+End-to-end load test for POST /fetch_report.
+
+Fires requests at each concurrency level and reports p50/p95/p99 latency
+and throughput. Against a running API:
+
+    python bench/fetch_report_bench.py --url http://127.0.0.1:5000 --api-key $API_KEY -c 1,4,8 -n 40
+
+Or fully local: start bench/mock_smartcredit.py and the API in-process
+(the API picks up the mock through SMARTCREDIT_BASE_URL):
+
+    python bench/fetch_report_bench.py --local --tradelines 500 --latency-ms 100 -c 1,4,8,16
+
+Every request uses its own credentials (bench+N@example.com), so each one
+is a real login and fetch. With --same-user all requests share --email and
+the API coalesces them (single-flight fetch, session cache); run both to
+see fetch_report under load and the coalescing gain separately.
+"""
+import argparse
+import json
+import os
+import sys
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import requests
+
+
+def percentile(sorted_values: list, pct: float) -> float:
+    """Nearest-rank percentile of an already sorted list."""
+    if not sorted_values:
+        return float("nan")
+    rank = max(1, int(round(pct / 100 * len(sorted_values))))
+    return sorted_values[min(rank, len(sorted_values)) - 1]
+
+
+def start_local(args) -> str:
+    """Mock site + API in this process; returns the API base URL."""
+    sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+    from mock_smartcredit import MockSmartCredit, serve
+
+    mock = MockSmartCredit(tradelines=args.tradelines, latency_ms=args.latency_ms,
+                           jitter_ms=args.jitter_ms, error_rate=args.error_rate)
+    mock_server = serve(mock, port=0)
+    os.environ["SMARTCREDIT_BASE_URL"] = f"http://127.0.0.1:{mock_server.server_port}"
+    os.environ["RESOURCE_ALLOWED_DOMAINS"] = "127.0.0.1"
+    os.environ.setdefault("API_KEY", args.api_key or "bench")
+    args.api_key = os.environ["API_KEY"]
+
+    import threading
+    from werkzeug.serving import WSGIRequestHandler, make_server
+    import main_api
+
+    class QuietHandler(WSGIRequestHandler):
+        def log_request(self, *args, **kwargs):
+            pass
+
+    api_server = make_server("127.0.0.1", 0, main_api.app, threaded=True, request_handler=QuietHandler)
+    threading.Thread(target=api_server.serve_forever, daemon=True).start()
+    return f"http://127.0.0.1:{api_server.server_port}"
+
+
+def one_request(session: requests.Session, url: str, headers: dict, body: dict):
+    start = time.perf_counter()
+    try:
+        resp = session.post(url, headers=headers, data=json.dumps(body), timeout=300)
+        status = resp.status_code
+        resp.content  # include body transfer in the timing
+    except requests.RequestException:
+        status = None
+    return time.perf_counter() - start, status
+
+
+def request_bodies(args, first: int, total: int) -> list:
+    """Request bodies numbered from `first`; distinct credentials per request unless --same-user."""
+    bodies = []
+    local_part, _, domain = args.email.partition("@")
+    for i in range(first, first + total):
+        email = args.email if args.same_user else f"{local_part}+{i}@{domain}"
+        bodies.append({"email": email, "password": args.password, "force_refresh": not args.cached})
+    return bodies
+
+
+def run_level(url: str, headers: dict, bodies: list, concurrency: int) -> dict:
+    total = len(bodies)
+    sessions = [requests.Session() for _ in range(concurrency)]
+    with ThreadPoolExecutor(max_workers=concurrency) as pool:
+        started = time.perf_counter()
+        futures = [pool.submit(one_request, sessions[i % concurrency], url, headers, body) for i, body in enumerate(bodies)]
+        results = [f.result() for f in futures]
+        wall = time.perf_counter() - started
+
+    latencies = sorted(elapsed for elapsed, status in results if status == 200)
+    statuses = {}
+    for _, status in results:
+        statuses[status] = statuses.get(status, 0) + 1
+    return {
+        "concurrency": concurrency,
+        "requests": total,
+        "users": len({body["email"] for body in bodies}),
+        "ok": len(latencies),
+        "statuses": statuses,
+        "p50_ms": percentile(latencies, 50) * 1000,
+        "p95_ms": percentile(latencies, 95) * 1000,
+        "p99_ms": percentile(latencies, 99) * 1000,
+        "throughput_rps": len(latencies) / wall if wall else 0.0,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--url", default="http://127.0.0.1:5000", help="API base URL")
+    parser.add_argument("--api-key", default=os.getenv("API_KEY"))
+    parser.add_argument("-c", "--concurrency", default="1,4,8", help="comma-separated concurrency levels")
+    parser.add_argument("-n", "--requests", type=int, default=20, help="requests per concurrency level")
+    parser.add_argument("--email", default="bench@example.com", help="base address; requests use bench+N@example.com")
+    parser.add_argument("--password", default="bench-password")
+    parser.add_argument("--same-user", action="store_true",
+                        help="send every request with --email, measuring request coalescing instead of fetches")
+    parser.add_argument("--cached", action="store_true", help="allow result-cache hits (default sends force_refresh)")
+    parser.add_argument("--json", action="store_true", help="print results as JSON lines")
+    local = parser.add_argument_group("local mode")
+    local.add_argument("--local", action="store_true", help="start the mock site and the API in-process")
+    local.add_argument("--tradelines", type=int, default=50)
+    local.add_argument("--latency-ms", type=float, default=0)
+    local.add_argument("--jitter-ms", type=float, default=0)
+    local.add_argument("--error-rate", type=float, default=0.0)
+    args = parser.parse_args()
+
+    base_url = start_local(args) if args.local else args.url.rstrip("/")
+    url = f"{base_url}/fetch_report"
+    headers = {"Content-Type": "application/json", "x-api-key": args.api_key or ""}
+
+    if not args.json:
+        print(f"{'conc':>5} {'reqs':>5} {'users':>5} {'ok':>5} {'p50 ms':>9} {'p95 ms':>9} {'p99 ms':>9} {'req/s':>8}  statuses")
+    levels = [int(c) for c in args.concurrency.split(",") if c.strip()]
+    for n, level in enumerate(levels):
+        # Numbered across levels too, so no level reuses a session cached by an earlier one
+        result = run_level(url, headers, request_bodies(args, n * args.requests, args.requests), level)
+        if args.json:
+            print(json.dumps(result, default=str))
+        else:
+            print(f"{result['concurrency']:>5} {result['requests']:>5} {result['users']:>5} {result['ok']:>5} "
+                  f"{result['p50_ms']:>9.1f} {result['p95_ms']:>9.1f} {result['p99_ms']:>9.1f} "
+                  f"{result['throughput_rps']:>8.2f}  {result['statuses']}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,186 @@
+"""
+Local stand-in for the SmartCredit member site, for benchmarks and smoke runs.
+
+Serves the login form (j_username / j_password / loginbttn), the four
+ENDPOINTS JSON payloads, and the smart-3b score page. It can inject
+latency and errors. Point the API at it with:
+
+    python bench/mock_smartcredit.py --port 8801 --tradelines 300 --latency-ms 150
+    SMARTCREDIT_BASE_URL=http://127.0.0.1:8801 RESOURCE_ALLOWED_DOMAINS=127.0.0.1 python main_api.py
+
+Payloads come from bench/synthetic.py. Stdlib only, so it runs anywhere
+the API does.
+"""
+import argparse
+import json
+import random
+import secrets
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlsplit
+
+from synthetic import bureau_scores, generate_raw
+
+LOGIN_PAGE = """<!doctype html>
+<html><body>
+<form id="loginForm" action="/login" method="post">
+  <input type="hidden" name="_csrf" value="{csrf}">
+  <input id="j_username" name="j_username" type="text">
+  <input id="j_password" name="j_password" type="password">
+  {captcha}
+  <button name="loginbttn" type="submit" value="Login">Log In</button>
+</form>
+{error}
+</body></html>"""
+
+SCORE_PAGE = """<!doctype html>
+<html><body>
+<div class="border-transunion"><h1 class="fw-bold">{TransUnion}</h1></div>
+<div class="border-experian"><h1 class="fw-bold">{Experian}</h1></div>
+<div class="border-equifax"><h1 class="fw-bold">{Equifax}</h1></div>
+</body></html>"""
+
+
+# -----------------------------
+# Server
+# -----------------------------
+class MockSmartCredit:
+    """Pre-rendered responses plus the knobs the handler reads on every request."""
+
+    def __init__(self, tradelines=50, inquiries=5, password=None, latency_ms=0, jitter_ms=0,
+                 error_rate=0.0, error_status=503, captcha=False, seed=0):
+        payloads = generate_raw(tradelines=tradelines, inquiries=inquiries, seed=seed)
+        scores = bureau_scores(seed)
+        # Serialized once; every request serves the same bytes
+        self.json_bodies = {
+            "/member/privacy/search-results": json.dumps(payloads["search_results"]).encode(),
+            "/member/privacy/search-result-statistics": json.dumps(payloads["statistics"]).encode(),
+            "/member/money-manager/law/trades": json.dumps(payloads["trades"]).encode(),
+            "/member/credit-report/3b/simple.htm": json.dumps(payloads["credit_report_json"]).encode(),
+        }
+        self.score_page = SCORE_PAGE.format(**scores).encode()
+        self.password = password
+        self.latency_ms = latency_ms
+        self.jitter_ms = jitter_ms
+        self.error_rate = error_rate
+        self.error_status = error_status
+        self.captcha = captcha
+        self.sessions = set()
+        self.lock = threading.Lock()
+        self.rnd = random.Random(seed)
+
+    def delay(self):
+        if self.latency_ms or self.jitter_ms:
+            with self.lock:
+                jitter = self.rnd.uniform(-self.jitter_ms, self.jitter_ms)
+            time.sleep(max(0.0, self.latency_ms + jitter) / 1000)
+
+    def should_fail(self) -> bool:
+        if not self.error_rate:
+            return False
+        with self.lock:
+            return self.rnd.random() < self.error_rate
+
+
+class Handler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"  # keep-alive, like the real site
+    mock: MockSmartCredit = None
+
+    def log_message(self, format, *args):
+        pass
+
+    def _send(self, status, body=b"", content_type="text/html; charset=utf-8", headers=None):
+        self.send_response(status)
+        self.send_header("Content-Type", content_type)
+        self.send_header("Content-Length", str(len(body)))
+        for key, value in (headers or {}).items():
+            self.send_header(key, value)
+        self.end_headers()
+        self.wfile.write(body)
+
+    def _redirect(self, location, headers=None):
+        self._send(302, headers=dict(headers or {}, Location=location))
+
+    def _logged_in(self) -> bool:
+        for part in (self.headers.get("Cookie") or "").split(";"):
+            name, _, value = part.strip().partition("=")
+            if name == "SESSION" and value in self.mock.sessions:
+                return True
+        return False
+
+    def _login_page(self, error=""):
+        captcha = '<div class="g-recaptcha" data-sitekey="mock"></div>' if self.mock.captcha else ""
+        body = LOGIN_PAGE.format(csrf=secrets.token_hex(8), captcha=captcha, error=error)
+        self._send(200, body.encode())
+
+    def do_GET(self):
+        path = urlsplit(self.path).path
+        if path == "/login":
+            return self._login_page()
+        if not path.startswith("/member/"):
+            return self._send(404, b"not found")
+        if not self._logged_in():
+            return self._redirect("/login")
+
+        self.mock.delay()
+        if path in self.mock.json_bodies:
+            if self.mock.should_fail():
+                return self._send(self.mock.error_status, b'{"error": "injected"}', "application/json")
+            return self._send(200, self.mock.json_bodies[path], "application/json")
+        if path == "/member/credit-report/smart-3b/":
+            return self._send(200, self.mock.score_page)
+        return self._send(200, b"<html><body>member home</body></html>")
+
+    def do_POST(self):
+        if urlsplit(self.path).path != "/login":
+            return self._send(404, b"not found")
+        length = int(self.headers.get("Content-Length") or 0)
+        form = parse_qs(self.rfile.read(length).decode())
+        self.mock.delay()
+        password = (form.get("j_password") or [""])[0]
+        if self.mock.captcha or not form.get("j_username") or (self.mock.password and password != self.mock.password):
+            return self._redirect("/login?error=true")
+        session_id = secrets.token_hex(16)
+        with self.mock.lock:
+            self.mock.sessions.add(session_id)
+        self._redirect("/member/home", {"Set-Cookie": f"SESSION={session_id}; Path=/; HttpOnly"})
+
+
+def serve(mock: MockSmartCredit, host="127.0.0.1", port=8801) -> ThreadingHTTPServer:
+    """Start the mock on a daemon thread; returns the server (server.server_port for port=0)."""
+    handler = type("BoundHandler", (Handler,), {"mock": mock})
+    server = ThreadingHTTPServer((host, port), handler)
+    server.daemon_threads = True
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8801)
+    parser.add_argument("--tradelines", type=int, default=50, help="accounts in the payloads (rawReport size)")
+    parser.add_argument("--inquiries", type=int, default=5)
+    parser.add_argument("--password", help="only accept this password (default: any)")
+    parser.add_argument("--latency-ms", type=float, default=0, help="added to every member/login response")
+    parser.add_argument("--jitter-ms", type=float, default=0)
+    parser.add_argument("--error-rate", type=float, default=0.0, help="fraction of JSON endpoint calls that fail")
+    parser.add_argument("--error-status", type=int, default=503)
+    parser.add_argument("--captcha", action="store_true", help="show a CAPTCHA and reject every login")
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    mock = MockSmartCredit(args.tradelines, args.inquiries, args.password, args.latency_ms, args.jitter_ms,
+                           args.error_rate, args.error_status, args.captcha, args.seed)
+    server = serve(mock, args.host, args.port)
+    raw_kb = len(mock.json_bodies["/member/credit-report/3b/simple.htm"]) / 1024
+    print(f"Mock SmartCredit on http://{args.host}:{server.server_port} ({args.tradelines} tradelines, rawReport {raw_kb:.0f} KB)")
+    try:
+        threading.Event().wait()
+    except KeyboardInterrupt:
+        server.shutdown()
+
+
+if __name__ == "__main__":
+    main()
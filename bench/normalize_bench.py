@@ -0,0 +1,161 @@
+"""
+Micro-benchmarks for normalize_report, section by section.
+
+For each synthetic profile (bench/synthetic.py) this times the rawReport
+parse (ParsedReport) and every NORMALIZERS section, then does a separate
+tracemalloc pass for each stage's peak and retained allocations. Results
+can be saved as a baseline and compared on later runs:
+
+    python bench/normalize_bench.py --save-baseline           # record bench/baselines/normalize.json
+    python bench/normalize_bench.py                           # compare against it
+    python bench/normalize_bench.py -p huge -r 3 --fail-on-regression
+    python bench/normalize_bench.py -p huge --parser stream     # rawReport via ijson (RAW_REPORT_PARSER)
+
+Timings are wall-clock medians, so baselines only compare like with like:
+the same machine and Python version.
+"""
+import argparse
+import json
+import os
+import platform
+import statistics
+import sys
+import time
+import tracemalloc
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, os.path.dirname(HERE))
+
+import main_api  # noqa: E402
+from synthetic import PROFILES, bureau_scores, generate_raw  # noqa: E402
+
+DEFAULT_BASELINE = os.path.join(HERE, "baselines", "normalize.json")
+
+
+def stages(raw: dict, scores: dict):
+    """(name, thunk) pairs: the parse, then each section against one shared ParsedReport."""
+    report_box = {}
+
+    def parse():
+        report_box["report"] = main_api.ParsedReport.from_raw(raw)
+
+    yield "parse", parse
+    for section, normalizer in main_api.NORMALIZERS.items():
+        yield section, (lambda normalizer=normalizer: normalizer(raw, report_box["report"], scores))
+    yield "total", lambda: main_api.normalize_report(raw, scores)
+
+
+def time_profile(raw: dict, scores: dict, repeat: int) -> dict:
+    samples = {}
+    for _ in range(repeat):
+        for name, thunk in stages(raw, scores):
+            start = time.perf_counter()
+            thunk()
+            samples.setdefault(name, []).append((time.perf_counter() - start) * 1000)
+    return {name: {"median_ms": statistics.median(values), "min_ms": min(values)} for name, values in samples.items()}
+
+
+def memory_profile(raw: dict, scores: dict) -> dict:
+    memory = {}
+    tracemalloc.start()
+    try:
+        for name, thunk in stages(raw, scores):
+            tracemalloc.reset_peak()
+            before, _ = tracemalloc.get_traced_memory()
+            result = thunk()
+            after, peak = tracemalloc.get_traced_memory()
+            memory[name] = {"peak_kb": (peak - before) / 1024, "retained_kb": (after - before) / 1024}
+            del result
+    finally:
+        tracemalloc.stop()
+    return memory
+
+
+def run(profiles: list, repeat: int) -> dict:
+    results = {}
+    for name in profiles:
+        sizes = PROFILES[name]
+        raw = generate_raw(**sizes)
+        scores = bureau_scores()
+        timings = time_profile(raw, scores, repeat)
+        memory = memory_profile(raw, scores)
+        results[name] = {
+            "sizes": sizes,
+            "raw_report_kb": round(len(raw["credit_report_json"]["rawReport"]) / 1024, 1),
+            "stages": {stage: {**timings[stage], **memory[stage]} for stage in timings},
+        }
+    return results
+
+
+def print_results(results: dict, baseline: dict, threshold: float) -> list:
+    """Print one table per profile; returns the (profile, stage, ratio) regressions."""
+    regressions = []
+    for profile, result in results.items():
+        base_stages = (baseline.get("profiles", {}).get(profile) or {}).get("stages", {})
+        print(f"\n{profile}: {result['sizes']['tradelines']} tradelines, rawReport {result['raw_report_kb']:,} KB")
+        print(f"  {'stage':<15} {'median ms':>10} {'min ms':>9} {'peak KB':>10} {'kept KB':>9} {'vs base':>8}")
+        for stage, row in result["stages"].items():
+            base = base_stages.get(stage)
+            ratio = row["median_ms"] / base["median_ms"] if base and base["median_ms"] else None
+            flag = ""
+            if ratio is not None and ratio > threshold and row["median_ms"] - base["median_ms"] > 0.5:
+                regressions.append((profile, stage, ratio))
+                flag = "  <-- slower"
+            ratio_text = f"{ratio:>7.2f}x" if ratio is not None else f"{'-':>8}"
+            print(f"  {stage:<15} {row['median_ms']:>10.2f} {row['min_ms']:>9.2f} {row['peak_kb']:>10,.0f} "
+                  f"{row['retained_kb']:>9,.0f} {ratio_text}{flag}")
+    return regressions
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("-p", "--profiles", default=",".join(PROFILES), help="comma-separated profile names")
+    parser.add_argument("-r", "--repeat", type=int, default=5, help="timed runs per profile (median reported)")
+    parser.add_argument("--baseline", default=DEFAULT_BASELINE)
+    parser.add_argument("--save-baseline", action="store_true", help="overwrite the baseline with this run")
+    parser.add_argument("--threshold", type=float, default=1.25, help="median ratio that counts as a regression")
+    parser.add_argument("--fail-on-regression", action="store_true", help="exit 1 when any stage regresses")
+    parser.add_argument("--parser", choices=("json", "stream", "auto"), default=main_api.RAW_REPORT_PARSER,
+                        help="rawReport parser (RAW_REPORT_PARSER); stream needs ijson")
+    args = parser.parse_args()
+    if args.parser != "json" and main_api.ijson is None:
+        parser.error("--parser stream/auto needs ijson installed")
+    main_api.RAW_REPORT_PARSER = args.parser
+
+    profiles = [p.strip() for p in args.profiles.split(",") if p.strip()]
+    unknown = [p for p in profiles if p not in PROFILES]
+    if unknown:
+        parser.error(f"unknown profiles: {', '.join(unknown)} (choose from {', '.join(PROFILES)})")
+
+    baseline = {}
+    if os.path.exists(args.baseline) and not args.save_baseline:
+        with open(args.baseline) as f:
+            baseline = json.load(f)
+
+    results = run(profiles, args.repeat)
+    regressions = print_results(results, baseline, args.threshold)
+
+    if args.save_baseline:
+        os.makedirs(os.path.dirname(args.baseline), exist_ok=True)
+        previous = {}
+        if os.path.exists(args.baseline):
+            with open(args.baseline) as f:
+                previous = json.load(f).get("profiles", {})
+        with open(args.baseline, "w") as f:
+            json.dump({
+                "python": platform.python_version(),
+                "machine": platform.machine(),
+                "repeat": args.repeat,
+                "parser": args.parser,
+                "profiles": {**previous, **results},
+            }, f, indent=2, sort_keys=True)
+            f.write("\n")
+        print(f"\nBaseline written to {args.baseline}")
+    elif regressions:
+        print(f"\n{len(regressions)} stage(s) slower than baseline by more than {args.threshold:.2f}x")
+        if args.fail_on_regression:
+            sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,102 @@
+"""
+Consistency checks for normalize_report on the synthetic profiles
+(bench/synthetic.py). Prints one line per check and exits 1 if any fails:
+
+    python bench/normalize_check.py
+
+bureau-names  the `mixed` profile (trades rows name their bureau, the
+              rawReport uses symbols) gives the same accounts as `typical`,
+              in every schema: names and symbols of a bureau must merge.
+raw-parsers   RAW_REPORT_PARSER "stream" (ijson) and "json" give identical
+              reports for the thin, typical and thick profiles, and for
+              truncated, non-JSON and oddly shaped rawReports. Skipped
+              when ijson is not installed.
+"""
+import contextlib
+import io
+import json
+import os
+import sys
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, os.path.dirname(HERE))
+
+import main_api  # noqa: E402
+from synthetic import PROFILES, bureau_scores, generate_raw  # noqa: E402
+
+
+def check_bureau_names() -> list:
+    failures = []
+    for schema in main_api.SCHEMAS:
+        accounts = {name: main_api.normalize_report(generate_raw(**PROFILES[name]), bureau_scores(), schema=schema)["accounts"]
+                    for name in ("typical", "mixed")}
+        counts = {name: len(accts) for name, accts in accounts.items()}
+        if counts["mixed"] != counts["typical"]:
+            failures.append(f"{schema}: {counts['mixed']} accounts with bureau names, {counts['typical']} with symbols")
+        elif ({main_api._account_identity(a) for a in accounts["mixed"]}
+              != {main_api._account_identity(a) for a in accounts["typical"]}):
+            failures.append(f"{schema}: same account count ({counts['typical']}) but different accounts")
+    return failures
+
+
+def _raw_report_variants():
+    """(label, raw) pairs for the parser check."""
+    for name in ("thin", "typical", "thick"):
+        yield name, generate_raw(**PROFILES[name])
+    raw = generate_raw(**PROFILES["typical"])
+    raw_report = raw["credit_report_json"]["rawReport"]
+    components = json.loads(raw_report)["BundleComponents"]["BundleComponent"]
+    malformed = {
+        "truncated": raw_report[:len(raw_report) // 2],
+        "not-json": "<html>Service Unavailable</html>",
+        "list": json.dumps(components),
+        "components-list": json.dumps({"BundleComponents": components}),
+        "single-component": json.dumps({"BundleComponents": {"BundleComponent": components[0]}}),
+    }
+    for label, text in malformed.items():
+        yield label, {**raw, "credit_report_json": {"rawReport": text}}
+
+
+def check_raw_parsers():
+    if main_api.ijson is None:
+        return None
+    failures = []
+    parser = main_api.RAW_REPORT_PARSER
+    try:
+        for label, raw in _raw_report_variants():
+            for schema in main_api.SCHEMAS:
+                reports = {}
+                for mode in ("json", "stream"):
+                    main_api.RAW_REPORT_PARSER = mode
+                    with contextlib.redirect_stdout(io.StringIO()):  # parse warnings are expected here
+                        reports[mode] = main_api.dumps_canonical(main_api.normalize_report(raw, bureau_scores(), schema=schema))
+                if reports["json"] != reports["stream"]:
+                    failures.append(f"{label} ({schema}): stream and json reports differ")
+    finally:
+        main_api.RAW_REPORT_PARSER = parser
+    return failures
+
+
+CHECKS = {
+    "bureau-names": check_bureau_names,
+    "raw-parsers": check_raw_parsers,
+}
+
+
+def main():
+    failed = 0
+    for name, check in CHECKS.items():
+        failures = check()
+        if failures is None:
+            print(f"{name:<15} skipped")
+            continue
+        print(f"{name:<15} {'FAIL' if failures else 'ok'}")
+        for failure in failures:
+            print(f"  {failure}")
+        failed += bool(failures)
+    if failed:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
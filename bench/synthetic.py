@@ -0,0 +1,198 @@
+"""
+Deterministic synthetic SmartCredit payloads for benchmarks.
+
+generate_raw() builds the four ENDPOINTS payloads the API aggregates:
+`trades.trades`, `search_results` (inquiries + public records),
+`statistics`, and `credit_report_json` whose `rawReport` string carries a
+MergeCreditReports component (Borrower, TradeLinePartition,
+InquiryPartition) plus TUC/EXP/EQF `*ReportV6` components. The same
+seed and sizes always give byte-identical output.
+
+Sizes run from a thin file up to several thousand tradelines; PROFILES holds
+the ones the benchmarks use. With bureau_names the trades rows name their
+bureau ("TransUnion") while the rawReport keeps symbols ("TUC"), as some
+member-area responses do; normalization must still merge those accounts.
+"""
+import json
+import random
+
+BUREAUS = (("TUC", "TransUnion"), ("EXP", "Experian"), ("EQF", "Equifax"))
+CREDITORS = (
+    "CAPITAL ONE", "CHASE CARD", "DISCOVER BANK", "AMEX", "CITIBANK", "WELLS FARGO", "SYNCB/AMAZON",
+    "NAVIENT", "TOYOTA MOTOR CREDIT", "ROCKET MORTGAGE", "BARCLAYS BANK", "US BANK", "ALLY FINANCIAL",
+    "SANTANDER", "DEPT OF EDUCATION", "MIDLAND CREDIT MGMT",
+)
+ACCOUNT_TYPES = (
+    ("Revolving", "Credit Card"), ("Revolving", "Charge Account"), ("Installment", "Auto Loan"),
+    ("Installment", "Student Loan"), ("Mortgage", "Conventional Real Estate Mortgage"), ("Open", "Collection"),
+)
+CONDITIONS = ("Open", "Open", "Open", "Closed", "Paid", "Derogatory")
+STREETS = ("MAIN", "OAK", "PINE", "MAPLE", "CEDAR", "ELM", "LAKE", "HILL")
+CITIES = (("AUSTIN", "TX", "78701"), ("DENVER", "CO", "80202"), ("TAMPA", "FL", "33602"), ("FRESNO", "CA", "93721"))
+
+# name -> generate_raw() keyword arguments
+PROFILES = {
+    "thin": {"tradelines": 3, "inquiries": 1, "addresses": 1, "public_records": 0, "employers": 1},
+    "typical": {"tradelines": 35, "inquiries": 8, "addresses": 4, "public_records": 1, "employers": 2},
+    "thick": {"tradelines": 300, "inquiries": 40, "addresses": 12, "public_records": 3, "employers": 4},
+    "huge": {"tradelines": 2500, "inquiries": 200, "addresses": 40, "public_records": 8, "employers": 8},
+    # typical, with bureau names in the trades rows (see generate_raw)
+    "mixed": {"tradelines": 35, "inquiries": 8, "addresses": 4, "public_records": 1, "employers": 2, "bureau_names": True},
+}
+
+
+def _date(rnd: random.Random, first_year: int = 2000, last_year: int = 2024) -> str:
+    return f"{rnd.randint(first_year, last_year)}-{rnd.randint(1, 12):02d}-{rnd.randint(1, 28):02d}"
+
+
+def _source(symbol: str, description: str) -> dict:
+    return {"Bureau": {"symbol": symbol, "abbreviation": symbol, "description": description}}
+
+
+def _address(rnd: random.Random) -> dict:
+    city, state, postal = rnd.choice(CITIES)
+    if rnd.random() < 0.2:
+        return {"unparsedStreet": f"{rnd.randint(1, 9999)} {rnd.choice(STREETS)} RD APT {rnd.randint(1, 40)}",
+                "city": city, "stateCode": state, "postalCode": postal}
+    return {"houseNumber": str(rnd.randint(1, 9999)), "direction": rnd.choice(("", "N", "S")),
+            "streetName": rnd.choice(STREETS), "streetType": rnd.choice(("ST", "AVE", "DR")),
+            "city": city, "stateCode": state, "postalCode": postal}
+
+
+def bureau_scores(seed: int = 0) -> dict:
+    """Bureau -> score string; what the smart-3b page shows for this seed."""
+    rnd = random.Random(f"scores:{seed}")
+    return {description: str(rnd.randint(520, 830)) for _, description in BUREAUS}
+
+
+def generate_raw(tradelines: int = 35, inquiries: int = 8, addresses: int = 4, public_records: int = 1,
+                 employers: int = 2, seed: int = 0, bureau_names: bool = False) -> dict:
+    """Aggregated ENDPOINTS payloads (the `raw` normalize_report takes) for one synthetic member."""
+    rnd = random.Random(seed)
+    scores = bureau_scores(seed)
+
+    trades = []
+    partition = []
+    per_bureau = {symbol: [] for symbol, _ in BUREAUS}
+    for i in range(tradelines):
+        creditor = CREDITORS[rnd.randrange(len(CREDITORS))]
+        number = f"{rnd.randint(100000, 999999)}XXXX{i:05d}"
+        account_type, type_display = ACCOUNT_TYPES[rnd.randrange(len(ACCOUNT_TYPES))]
+        condition = rnd.choice(CONDITIONS)
+        limit = rnd.choice((500, 1000, 2500, 5000, 10000, 25000, 250000))
+        balance = rnd.randint(0, limit)
+        opened = _date(rnd)
+        closed = _date(rnd, int(opened[:4]), 2024) if condition in ("Closed", "Paid") else None
+        reported = _date(rnd, 2023, 2024)
+        reporting = [b for b in BUREAUS if rnd.random() < 0.85] or [BUREAUS[i % 3]]
+
+        # Member-area trades endpoint: one row per (account, bureau) it tracks
+        for symbol, description in reporting[:rnd.randint(1, len(reporting))]:
+            trades.append({
+                "institution": {"name": creditor},
+                "accountTypeDisplay": type_display,
+                "accountTypeObj": {"description": type_display},
+                "memberCodeAccount": {"creditorContact": {"creditorContactSource": description if bureau_names else symbol}},
+                "accountStatus": condition,
+                "currentBalanceAmount": str(balance),
+                "creditLimitAmount": str(limit),
+                "highCreditAmount": str(max(balance, rnd.randint(0, limit))),
+                "openDateFormatted": opened,
+                "closedDate": closed,
+                "maskedAccountNumber": number,
+                "termsMonthlyPayment": str(rnd.randint(25, 900)) if account_type != "Revolving" else None,
+                "lastReported": reported,
+                "memberCode": f"{rnd.randint(1000000, 9999999)}",
+                "paymentHistory": "".join(rnd.choice("CCCCCCC1") for _ in range(24)),
+                "times30Late": str(rnd.choice((0, 0, 0, 1, 2))),
+                "times60Late": str(rnd.choice((0, 0, 0, 1))),
+                "times90Late": "0",
+            })
+
+        # rawReport TradeLinePartition: one partition per account, a Tradeline per bureau
+        bureau_lines = [{
+            "creditorName": creditor,
+            "accountNumber": number,
+            "accountType": account_type,
+            "accountTypeDescription": type_display,
+            "accountCondition": {"description": condition, "abbreviation": condition[:1]},
+            "currentBalance": str(balance),
+            "creditLimit": str(limit),
+            "highBalance": str(balance),
+            "dateOpened": opened,
+            "dateClosed": closed,
+            "dateReported": reported,
+            "Source": _source(symbol, description),
+            "GrantedTrade": {"monthsReviewed": str(rnd.randint(1, 120)),
+                             "PayStatusHistory": {"status": "".join(rnd.choice("CCCC1") for _ in range(48))}},
+        } for symbol, description in reporting]
+        partition.append({
+            "accountTypeSymbol": account_type[:1],
+            "Tradeline": bureau_lines[0] if len(bureau_lines) == 1 else bureau_lines,
+        })
+
+        # Per-bureau report components; a few accounts only show up here
+        for symbol, _ in reporting:
+            per_bureau[symbol].append({"creditorName": creditor, "accountNumber": number,
+                                       "currentBalance": str(balance), "dateOpened": opened})
+    for symbol, description in BUREAUS:
+        for j in range(max(1, tradelines // 50)):
+            per_bureau[symbol].append({"creditorName": rnd.choice(CREDITORS), "accountNumber": f"{symbol}ONLY{j:05d}",
+                                       "accountType": "Revolving", "currentBalance": str(rnd.randint(0, 900)),
+                                       "dateOpened": _date(rnd)})
+
+    # Inquiries: some only in search_results, some only in the rawReport, some in both
+    inquiry_rows = []
+    for i in range(inquiries):
+        symbol, description = BUREAUS[rnd.randrange(3)]
+        inquiry_rows.append({"subscriberName": rnd.choice(CREDITORS), "inquiryDate": _date(rnd, 2022, 2024),
+                             "inquiryType": rnd.choice(("I", "H", "S")), "Source": _source(symbol, description)})
+    search_inquiries = [
+        {"bureau": row["Source"]["Bureau"]["description"], "subscriberName": row["subscriberName"],
+         "inquiryDate": row["inquiryDate"], "inquiryType": row["inquiryType"]}
+        for n, row in enumerate(inquiry_rows) if n % 3 != 2
+    ]
+    inquiry_partition = [{"Inquiry": row} for n, row in enumerate(inquiry_rows) if n % 3 != 0]
+
+    borrower = {
+        "Name": [
+            {"NameType": {"abbreviation": "Primary"}, "Name": {"first": "JORDAN", "middle": "T", "last": f"SAMPLE{seed}"}},
+            {"NameType": {"abbreviation": "Aka"}, "Name": {"first": "JORDY", "last": f"SAMPLE{seed}"}},
+        ],
+        "SocialPartition": {"Social": f"XXX-XX-{rnd.randint(1000, 9999)}"},
+        "Birth": [{"date": _date(rnd, 1950, 2000)}],
+        "BorrowerAddress": [{"CreditAddress": _address(rnd), "Source": _source(*BUREAUS[0])}],
+        "PreviousAddress": [{"CreditAddress": _address(rnd), "dateReported": _date(rnd),
+                             "Source": _source(*BUREAUS[n % 3])} for n in range(addresses)],
+        "CreditScore": [{"riskScore": scores[description], "scoreName": "VantageScore3",
+                         "Source": _source(symbol, description)} for symbol, description in BUREAUS],
+        "Employer": [{"name": f"EMPLOYER {n}", "dateReported": _date(rnd, 2015, 2024),
+                      "Source": _source(*BUREAUS[n % 3])} for n in range(employers)],
+    }
+    components = [{"Type": "MergeCreditReports", "TrueLinkCreditReportType": {
+        "Borrower": borrower,
+        "TradeLinePartition": partition,
+        "InquiryPartition": inquiry_partition,
+        "Summary": {"TradelineSummary": {"totalAccounts": str(tradelines)}},
+    }}]
+    components += [{"Type": f"{symbol}ReportV6", "CreditReportType": {"Tradeline": per_bureau[symbol]}}
+                   for symbol, _ in BUREAUS]
+
+    return {
+        "search_results": {
+            "inquiries": search_inquiries,
+            "publicRecords": [{"type": rnd.choice(("Bankruptcy", "Civil Judgment", "Tax Lien")),
+                               "dateFiled": _date(rnd, 2005, 2020), "status": rnd.choice(("Discharged", "Satisfied")),
+                               "amount": str(rnd.randint(500, 50000))} for _ in range(public_records)],
+        },
+        "statistics": {"totalResults": len(search_inquiries), "publicRecordCount": public_records},
+        "trades": {"trades": trades},
+        "credit_report_json": {"rawReport": json.dumps({"BundleComponents": {"BundleComponent": components}})},
+    }
+
+
+if __name__ == "__main__":
+    for name, sizes in PROFILES.items():
+        raw = generate_raw(**sizes)
+        raw_kb = len(raw["credit_report_json"]["rawReport"]) / 1024
+        print(f"{name:>8}: {sizes['tradelines']:>5} tradelines, {len(raw['trades']['trades']):>5} trades rows, rawReport {raw_kb:,.0f} KB")
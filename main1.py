@@ -62,20 +62,30 @@ Features:
 3. Extracts scores from /member/credit-report/smart-3b/ page
 4. Saves raw JSON to data/smartcredit_raw.json
 5. Normalizes accounts and scores into CSV/XLSX
+6. Optionally appends accounts and scores to Parquet datasets (EXPORT_PARQUET=true)
 """
 
 import os
 import json
+import uuid
+from datetime import datetime, timezone
 import pandas as pd
 from pathlib import Path
 from playwright.sync_api import sync_playwright
 from dotenv import load_dotenv
 
+try:
+    import pyarrow as pa  # optional: Parquet export
+    import pyarrow.parquet as pq
+except ImportError:
+    pa = pq = None
+
 # Load environment variables
 load_dotenv()
 EMAIL = os.getenv("SMARTCREDIT_EMAIL")
 PASSWORD = os.getenv("SMARTCREDIT_PASSWORD")
 HEADLESS = os.getenv("PLAYWRIGHT_HEADLESS", "true").lower() == "true"
+EXPORT_PARQUET = os.getenv("EXPORT_PARQUET", "false").lower() == "true"
 
 if not EMAIL or not PASSWORD:
     raise SystemExit("❌ Please set SMARTCREDIT_EMAIL and SMARTCREDIT_PASSWORD in .env")
@@ -91,6 +101,9 @@ DATA_DIR.mkdir(exist_ok=True)
 RAW_JSON = DATA_DIR / "smartcredit_raw.json"
 ACCOUNTS_CSV = DATA_DIR / "smartcredit_accounts.csv"
 SCORES_CSV = DATA_DIR / "smartcredit_scores.csv"
+# One Parquet file per run under <dataset>/run_date=YYYY-MM-DD/, so runs append and
+# pyarrow.dataset / pd.read_parquet(PARQUET_DIR / "accounts") load months at once
+PARQUET_DIR = Path(os.getenv("PARQUET_DIR", str(DATA_DIR / "parquet")))
 
 # JSON endpoints (trades, privacy, etc.)
 ENDPOINTS = {
@@ -99,42 +112,67 @@ ENDPOINTS = {
     "trades": "https://www.smartcredit.com/member/money-manager/law/trades",
 }
 
-def normalize_and_export(raw: dict, scores: dict):
-    """Normalize JSON into accounts.csv and scores.csv"""
+def account_rows(raw: dict) -> pd.DataFrame:
+    """One row per (account, bureau) from the credit_report JSON."""
+    credit_report = raw.get("credit_report", {})
+    accounts = credit_report.get("accounts") if isinstance(credit_report.get("accounts"), list) else []
+    return pd.DataFrame({
+        "account_name": [a.get("creditorName") or a.get("subscriberCode") or "Unknown" for a in accounts],
+        "bureau": [a["report_type"].capitalize() if a.get("report_type") else None for a in accounts],  # 'equifax' / 'experian' / 'transunion'
+        "balance": [a.get("balance_owed") for a in accounts],
+        "limit": [a.get("credit_limit") for a in accounts],
+        "status": [a.get("account_status") for a in accounts],
+    })
+
+
+def pivot_accounts(rows: pd.DataFrame) -> pd.DataFrame:
+    """
+    One row per account with balance_/limit_/status_<Bureau> columns for every
+    bureau in the data (the bureau's last row wins when it repeats an account).
+    Accounts and bureaus keep the order they first appear in.
+    """
+    names = rows["account_name"].unique()
+    bureaus = rows["bureau"].dropna().unique()
+    if not len(bureaus):
+        return pd.DataFrame({"account_name": names})
+    latest = rows.dropna(subset=["bureau"]).drop_duplicates(["account_name", "bureau"], keep="last")
+    wide = latest.pivot(index="account_name", columns="bureau", values=["balance", "limit", "status"])
+    wide.columns = [f"{field}_{bureau}" for field, bureau in wide.columns]
+    columns = [f"{field}_{bureau}" for bureau in bureaus for field in ("balance", "limit", "status")]
+    wide = wide.reindex(index=names, columns=columns)
+    return wide.rename_axis("account_name").reset_index()
+
+
+def append_parquet(df: pd.DataFrame, dataset: str, fetched_at: datetime):
+    """Write `df` as a new file of the PARQUET_DIR/<dataset> Parquet dataset."""
+    if pq is None:
+        print("⚠️ EXPORT_PARQUET is set but pyarrow is not installed; skipping Parquet export")
+        return
+    df = df.assign(fetched_at=pd.Timestamp(fetched_at))
+    path = PARQUET_DIR / dataset / f"run_date={fetched_at:%Y-%m-%d}" / f"{fetched_at:%H%M%S}-{uuid.uuid4().hex[:8]}.parquet"
+    path.parent.mkdir(parents=True, exist_ok=True)
+    pq.write_table(pa.Table.from_pandas(df, preserve_index=False), path)
+    print(f"💾 Appended {len(df)} rows to {path}")
 
-    accounts = []
 
-    # Extract accounts from credit_report JSON (per bureau split)
-    credit_report = raw.get("credit_report", {})
-    if "accounts" in credit_report and isinstance(credit_report["accounts"], list):
-        for acct in credit_report["accounts"]:
-            account_name = acct.get("creditorName") or acct.get("subscriberCode") or "Unknown"
-            bureau = acct.get("report_type")  # should be 'equifax' / 'experian' / 'transunion'
-            balance = acct.get("balance_owed")
-            limit = acct.get("credit_limit")
-            status = acct.get("account_status")
-
-            # Find or create row for this account
-            existing = next((a for a in accounts if a["account_name"] == account_name), None)
-            if not existing:
-                existing = {"account_name": account_name}
-                accounts.append(existing)
-
-            # Fill in bureau-specific columns
-            if bureau:
-                b = bureau.capitalize()
-                existing[f"balance_{b}"] = balance
-                existing[f"limit_{b}"] = limit
-                existing[f"status_{b}"] = status
+def normalize_and_export(raw: dict, scores: dict):
+    """Normalize JSON into accounts.csv and scores.csv (and Parquet when EXPORT_PARQUET is set)"""
+    rows = account_rows(raw)
+    fetched_at = datetime.now(timezone.utc)
 
     # Save accounts (pivoted per bureau)
-    if accounts:
-        df = pd.DataFrame(accounts)
+    if len(rows):
+        df = pivot_accounts(rows)
         df.to_csv(ACCOUNTS_CSV, index=False)
         try:
             df.to_excel(str(ACCOUNTS_CSV.with_suffix(".xlsx")), index=False)
         except Exception as e:
             print("⚠️ Could not save XLSX for accounts:", e)
+        if EXPORT_PARQUET:
+            # Long form with fixed column types, so every run's file shares one schema however many bureaus it has
+            append_parquet(rows.astype({"account_name": "string", "bureau": "string", "status": "string"}).assign(
+                balance=pd.to_numeric(rows["balance"], errors="coerce"),
+                limit=pd.to_numeric(rows["limit"], errors="coerce")), "accounts", fetched_at)
 
     # Save scores
     if scores:
@@ -144,6 +182,10 @@ def normalize_and_export(raw: dict, scores: dict):
             sdf.to_excel(str(SCORES_CSV.with_suffix(".xlsx")), index=False)
         except Exception as e:
             print("⚠️ Could not save XLSX for scores:", e)
+        if EXPORT_PARQUET:
+            append_parquet(pd.DataFrame({"bureau": list(scores),
+                                         "score": pd.to_numeric(pd.Series(list(scores.values()), dtype="object"), errors="coerce")}),
+                           "scores", fetched_at)
 
         print("📊 Credit Scores:", scores)
     else:
@@ -356,18 +356,153 @@ main_api.py - Fetch raw + normalized SmartCredit report data via Playwright
 """
 
 import os
-from flask import Flask, request, jsonify
+import re
+import json
+import gzip
+import time
+import uuid
+import zlib
+import hmac
+import atexit
+import queue
+import hashlib
+import threading
+import multiprocessing
+from collections import OrderedDict
+from dataclasses import dataclass, fields, is_dataclass, asdict
+from datetime import date, datetime
+from contextlib import contextmanager, nullcontext
+from concurrent.futures import Future, ThreadPoolExecutor, ProcessPoolExecutor, as_completed, TimeoutError as FutureTimeout
+from urllib.parse import urlsplit, urljoin, parse_qs
+import requests
+from requests.adapters import HTTPAdapter
+from bs4 import BeautifulSoup
+from flask import Flask, request, jsonify, stream_with_context, g
+from flask.json.provider import DefaultJSONProvider
 from dotenv import load_dotenv
+from cryptography.fernet import Fernet, InvalidToken
 from playwright.sync_api import sync_playwright, TimeoutError as PWTimeout
 from functools import wraps
+import click
+
+try:
+    import orjson  # optional: much faster encoding of large reports
+except ImportError:
+    orjson = None
+
+try:
+    import ijson  # optional: incremental rawReport parsing
+except ImportError:
+    ijson = None
 
 load_dotenv()
 
 PLAYWRIGHT_HEADLESS = os.getenv("PLAYWRIGHT_HEADLESS", "true").lower() == "true"
 REQUEST_TIMEOUT_MS = int(os.getenv("PLAYWRIGHT_TIMEOUT_MS", "30000"))
 API_KEY = os.getenv("API_KEY")  # Add your API_KEY in .env
+BROWSER_MAX_CONTEXTS = int(os.getenv("BROWSER_MAX_CONTEXTS", "50"))  # recycle a browser after this many contexts
+SESSION_CACHE_TTL = int(os.getenv("SESSION_CACHE_TTL", "900"))  # seconds a logged-in storage state is reused
+SESSION_CACHE_MAX_ENTRIES = int(os.getenv("SESSION_CACHE_MAX_ENTRIES", "1000"))
+SESSION_CACHE_KEY = os.getenv("SESSION_CACHE_KEY")  # Fernet key; a random per-process key is used if unset
+CREDENTIAL_HASH_SECRET = os.getenv("CREDENTIAL_HASH_SECRET") or API_KEY or ""
+ENDPOINT_CONCURRENCY = int(os.getenv("ENDPOINT_CONCURRENCY", "4"))
+ENDPOINT_TIMEOUT_MS = int(os.getenv("ENDPOINT_TIMEOUT_MS", str(REQUEST_TIMEOUT_MS)))
+FETCH_MODE = os.getenv("FETCH_MODE", "browser").lower()  # browser | http (close the browser right after login)
+HTTP_POOL_MAXSIZE = int(os.getenv("HTTP_POOL_MAXSIZE", "16"))  # keep-alive connections per host
+HTTP_FETCH_WORKERS = int(os.getenv("HTTP_FETCH_WORKERS", "8"))
+LOGIN_STRATEGIES = [s.strip() for s in os.getenv("LOGIN_STRATEGIES", "http,playwright").lower().split(",") if s.strip()]
+HTTP_USER_AGENT = os.getenv(
+    "HTTP_USER_AGENT",
+    "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/124.0 Safari/537.36",
+)
+HTTP_LOGIN_SKIP_TTL = int(os.getenv("HTTP_LOGIN_SKIP_TTL", "900"))  # seconds the http strategy is skipped after it fell back
+JOB_WORKERS = int(os.getenv("JOB_WORKERS", "2"))  # concurrent browser sessions per process
+JOB_RESULT_TTL = int(os.getenv("JOB_RESULT_TTL", "600"))  # seconds finished jobs stay retrievable
+SYNC_WAIT_TIMEOUT = int(os.getenv("SYNC_WAIT_TIMEOUT", "110"))  # keep below the gunicorn --timeout
+RESULT_CACHE_TTL = int(os.getenv("RESULT_CACHE_TTL", "3600"))  # seconds a normalized report is served from cache
+RESULT_CACHE_MAX_ENTRIES = int(os.getenv("RESULT_CACHE_MAX_ENTRIES", "256"))
+STREAM_ACCOUNT_CHUNK = int(os.getenv("STREAM_ACCOUNT_CHUNK", "100"))  # accounts per NDJSON line
+DEFAULT_SCHEMA = os.getenv("DEFAULT_SCHEMA", "v1")  # report schema when a request names none (see SCHEMAS)
+# rawReport parsing: "json" (json.loads, fastest), "stream" (ijson; builds only what normalization
+# reads, so peak memory stays flat when the blob carries a lot else), or "auto" (stream large blobs)
+RAW_REPORT_PARSER = os.getenv("RAW_REPORT_PARSER", "json").lower()
+RAW_REPORT_STREAM_MIN_BYTES = int(os.getenv("RAW_REPORT_STREAM_MIN_BYTES", str(4 * 1024 * 1024)))  # "auto" streams from this size
+JSON_ENCODER = os.getenv("JSON_ENCODER", "auto").lower()  # auto (orjson when installed) | stdlib
+COMPRESS_MIN_BYTES = int(os.getenv("COMPRESS_MIN_BYTES", "1024"))  # smaller bodies are sent uncompressed
+COMPRESS_LEVEL = int(os.getenv("COMPRESS_LEVEL", "6"))
+BATCH_MAX_ITEMS = int(os.getenv("BATCH_MAX_ITEMS", "1000"))
+BATCH_CONCURRENCY = int(os.getenv("BATCH_CONCURRENCY", "2"))  # in-flight fetches per batch
+BATCH_RATE_PER_SEC = float(os.getenv("BATCH_RATE_PER_SEC", "0.5"))  # logins started per second across batches; <= 0 disables
+BATCH_PAGE_SIZE = int(os.getenv("BATCH_PAGE_SIZE", "50"))
+DELTA_HISTORY_MAX_ENTRIES = int(os.getenv("DELTA_HISTORY_MAX_ENTRIES", "256"))  # credentials whose last reports are kept for `since`
+DELTA_HISTORY_DEPTH = int(os.getenv("DELTA_HISTORY_DEPTH", "2"))  # report versions kept per credential
+RAW_STORE_DIR = os.getenv("RAW_STORE_DIR", "")  # directory for raw fetches (holds credit data); empty disables the store
+RAW_STORE_KEY = os.getenv("RAW_STORE_KEY")  # Fernet key raw blobs are encrypted with; required with RAW_STORE_DIR
+RAW_STORE_LEVEL = int(os.getenv("RAW_STORE_LEVEL", "6"))  # gzip level for stored blobs
+# Worker processes per backfill; half the CPUs by default so requests keep the rest
+RENORMALIZE_WORKERS = int(os.getenv("RENORMALIZE_WORKERS", str(max(1, (os.cpu_count() or 2) // 2))))
+# Latency histogram bucket bounds in seconds (comma-separated)
+METRICS_BUCKETS = tuple(float(b) for b in os.getenv(
+    "METRICS_BUCKETS", "0.01,0.05,0.1,0.25,0.5,1,2.5,5,10,20,30,60,120").split(","))
+
+USE_ORJSON = orjson is not None and JSON_ENCODER != "stdlib"
+if RAW_REPORT_PARSER != "json" and ijson is None:
+    print(f"Warning: RAW_REPORT_PARSER={RAW_REPORT_PARSER} needs ijson, which is not installed; rawReports are parsed with json.loads")
+
+
+def json_default(obj):
+    """Dates as ISO 8601 and dataclass records as objects; orjson does both natively, the stdlib needs this."""
+    if isinstance(obj, date):
+        return obj.isoformat()
+    if is_dataclass(obj) and not isinstance(obj, type):
+        return asdict(obj)
+    raise TypeError(f"Object of type {type(obj).__name__} is not JSON serializable")
+
+
+def _canonical_default(obj):
+    try:
+        return json_default(obj)
+    except TypeError:
+        return str(obj)
+
+
+def dumps_canonical(obj) -> bytes:
+    """Compact JSON with sorted keys; stable input for content hashes."""
+    if USE_ORJSON:
+        try:
+            return orjson.dumps(obj, default=str, option=orjson.OPT_SORT_KEYS | orjson.OPT_NON_STR_KEYS)
+        except (TypeError, orjson.JSONEncodeError):
+            pass  # e.g. integers beyond 64 bits; the stdlib handles those
+    return json.dumps(obj, sort_keys=True, separators=(",", ":"), default=_canonical_default).encode("utf-8")
+
+
+class FastJSONProvider(DefaultJSONProvider):
+    """Flask JSON provider that encodes with orjson when available, else the stdlib."""
+
+    @staticmethod
+    def default(obj):
+        # ISO dates rather than Flask's HTTP-date strings, matching orjson
+        try:
+            return json_default(obj)
+        except TypeError:
+            return DefaultJSONProvider.default(obj)
+
+    def dumps(self, obj, **kwargs):
+        if not USE_ORJSON or set(kwargs) - {"separators", "indent"}:
+            return super().dumps(obj, **kwargs)
+        option = orjson.OPT_NON_STR_KEYS
+        if self.sort_keys:
+            option |= orjson.OPT_SORT_KEYS
+        if kwargs.get("indent"):
+            option |= orjson.OPT_INDENT_2
+        try:
+            return orjson.dumps(obj, default=self.default, option=option).decode("utf-8")
+        except (TypeError, orjson.JSONEncodeError):
+            return super().dumps(obj, **kwargs)
+
 
 app = Flask(__name__)
+app.json = FastJSONProvider(app)
 
 # -----------------------------
 # API key protection
@@ -383,164 +518,1237 @@ def require_api_key(func):
 
 
 # -----------------------------
-# Endpoints
+# Response compression
 # -----------------------------
-ENDPOINTS = {
-    "search_results": "https://www.smartcredit.com/member/privacy/search-results",
-    "statistics": "https://www.smartcredit.com/member/privacy/search-result-statistics",
-    "trades": "https://www.smartcredit.com/member/money-manager/law/trades",
-    "credit_report_json": "https://www.smartcredit.com/member/credit-report/3b/simple.htm?format=JSON"
-}
-CREDIT_REPORT_HTML = "https://www.smartcredit.com/member/credit-report/smart-3b/"
+def compress_response(func):
+    """gzip/deflate the view's response when the client accepts it and it is big enough."""
+    @wraps(func)
+    def wrapper(*args, **kwargs):
+        response = app.make_response(func(*args, **kwargs))
+        response.vary.add("Accept-Encoding")
+        if (response.status_code != 200 or response.is_streamed or response.direct_passthrough
+                or "Content-Encoding" in response.headers):
+            return response
+
+        encoding = request.accept_encodings.best_match(["gzip", "deflate"])
+        body = response.get_data()
+        if not encoding or len(body) < COMPRESS_MIN_BYTES:
+            return response
+
+        with _stage("compress"):
+            if encoding == "gzip":
+                body = gzip.compress(body, compresslevel=COMPRESS_LEVEL, mtime=0)
+            else:
+                body = zlib.compress(body, COMPRESS_LEVEL)
+        response.set_data(body)
+        response.headers["Content-Encoding"] = encoding
+        # A strong ETag must change with the encoding; the weak form still matches If-None-Match
+        etag, weak = response.get_etag()
+        if etag and not weak:
+            response.set_etag(etag, weak=True)
+        return response
+    return wrapper
 
 
 # -----------------------------
-# Fetch Report
+# Metrics
 # -----------------------------
-def fetch_report_for_credentials(email: str, password: str, headless: bool = PLAYWRIGHT_HEADLESS, timeout_ms: int = REQUEST_TIMEOUT_MS):
-    aggregated = {}
-    scores = {}
+class MetricsRegistry:
+    """
+    Counters, gauges and histograms in Prometheus text format, kept in-process.
+    Each gunicorn worker has its own registry, so scrape every worker (or run one).
+    """
+
+    def __init__(self, buckets=METRICS_BUCKETS):
+        self.buckets = tuple(sorted(buckets))
+        self._meta = {}  # name -> (type, help)
+        self._values = {}  # name -> {label tuple: number, or [bucket counts, sum, count] for histograms}
+        self._lock = threading.Lock()
+
+    def describe(self, name: str, kind: str, help_text: str):
+        self._meta[name] = (kind, help_text)
+        self._values.setdefault(name, {})
+
+    def inc(self, name: str, value: float = 1, **labels):
+        key = tuple(sorted(labels.items()))
+        with self._lock:
+            series = self._values[name]
+            series[key] = series.get(key, 0) + value
+
+    def observe(self, name: str, value: float, **labels):
+        key = tuple(sorted(labels.items()))
+        with self._lock:
+            series = self._values[name]
+            hist = series.get(key)
+            if hist is None:
+                hist = series[key] = [[0] * len(self.buckets), 0.0, 0]
+            for i, bound in enumerate(self.buckets):
+                if value <= bound:
+                    hist[0][i] += 1
+                    break
+            hist[1] += value
+            hist[2] += 1
+
+    @staticmethod
+    def _labels(pairs) -> str:
+        if not pairs:
+            return ""
+        escaped = (str(v).replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"') for _, v in pairs)
+        return "{" + ",".join(f'{k}="{v}"' for (k, _), v in zip(pairs, escaped)) + "}"
+
+    def render(self) -> str:
+        lines = []
+        with self._lock:
+            for name, (kind, help_text) in self._meta.items():
+                lines.append(f"# HELP {name} {help_text}")
+                lines.append(f"# TYPE {name} {kind}")
+                for key, value in sorted(self._values[name].items()):
+                    if kind != "histogram":
+                        lines.append(f"{name}{self._labels(key)} {value:g}")
+                        continue
+                    counts, total, count = value
+                    cumulative = 0
+                    for bound, bucket_count in zip(self.buckets, counts):
+                        cumulative += bucket_count
+                        lines.append(f"{name}_bucket{self._labels(key + (('le', f'{bound:g}'),))} {cumulative}")
+                    lines.append(f"{name}_bucket{self._labels(key + (('le', '+Inf'),))} {count}")
+                    lines.append(f"{name}_sum{self._labels(key)} {total:g}")
+                    lines.append(f"{name}_count{self._labels(key)} {count}")
+        return "\n".join(lines) + "\n"
+
+
+metrics = MetricsRegistry()
+metrics.describe("smartcredit_http_requests_total", "counter", "API responses by route and status code.")
+metrics.describe("smartcredit_http_request_seconds", "histogram", "API request latency by route.")
+metrics.describe("smartcredit_http_requests_in_flight", "gauge", "API requests currently being handled.")
+metrics.describe("smartcredit_stage_seconds", "histogram", "Time spent in each report stage (login, endpoint.<name>, smart3b, normalize, serialize).")
+metrics.describe("smartcredit_report_outcomes_total", "counter", "Report job outcomes (ok, login_failed, error).")
+metrics.describe("smartcredit_result_cache_total", "counter", "Result cache lookups by result (hit, miss).")
+metrics.describe("smartcredit_logins_total", "counter", "Successful logins by path (http, http-cached, playwright, playwright-cached).")
+metrics.describe("smartcredit_login_fallbacks_total", "counter", "Login strategies that handed over to the next one.")
+metrics.describe("smartcredit_endpoint_responses_total", "counter", "SmartCredit endpoint responses by endpoint and HTTP status.")
+metrics.describe("smartcredit_score_scrape_misses_total", "counter", "Bureau scores not found on the smart-3b page.")
+metrics.describe("smartcredit_sections_reused_total", "counter", "Sections copied from the previous report because their source payloads were unchanged.")
+
+
+class StageTimer:
+    """Wall-clock seconds per stage of one report; feeds the Server-Timing header and stage histogram."""
+
+    def __init__(self):
+        self.stages = {}  # stage -> seconds, in the order stages first ran
+
+    @contextmanager
+    def stage(self, name: str):
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.record(name, time.perf_counter() - start)
+
+    def record(self, name: str, seconds: float):
+        self.stages[name] = self.stages.get(name, 0.0) + seconds
+        metrics.observe("smartcredit_stage_seconds", seconds, stage=name)
+
+    def merge(self, stages: dict):
+        """Add stages timed elsewhere (e.g. on a job thread) without observing them twice."""
+        for name, seconds in stages.items():
+            self.stages[name] = self.stages.get(name, 0.0) + seconds
+
+    def server_timing(self, total: float = None) -> str:
+        parts = [f"{name};dur={seconds * 1000:.1f}" for name, seconds in self.stages.items()]
+        if total is not None:
+            parts.append(f"total;dur={total * 1000:.1f}")
+        return ", ".join(parts)
+
+
+def _stage(name: str):
+    """Time `name` on the current request's StageTimer, if there is one."""
+    timer = g.get("stage_timer")
+    return timer.stage(name) if timer is not None else nullcontext()
+
+
+def instrument(route: str):
+    """Count, time and track in-flight requests for a route; adds the Server-Timing header."""
+    def decorator(func):
+        @wraps(func)
+        def wrapper(*args, **kwargs):
+            g.stage_timer = StageTimer()
+            metrics.inc("smartcredit_http_requests_in_flight", route=route)
+            start = time.perf_counter()
+            try:
+                response = app.make_response(func(*args, **kwargs))
+            finally:
+                metrics.inc("smartcredit_http_requests_in_flight", -1, route=route)
+            elapsed = time.perf_counter() - start
+            metrics.observe("smartcredit_http_request_seconds", elapsed, route=route)
+            metrics.inc("smartcredit_http_requests_total", route=route, status=str(response.status_code))
+            response.headers["Server-Timing"] = g.stage_timer.server_timing(total=elapsed)
+            return response
+        return wrapper
+    return decorator
 
-    with sync_playwright() as p:
-        browser = p.chromium.launch(headless=True, args=["--no-sandbox"])
-        context = browser.new_context()
-        page = context.new_page()
 
-        # --- Login ---
-        page.goto("https://www.smartcredit.com/login", wait_until="domcontentloaded", timeout=timeout_ms)
-        page.fill("input#j_username", email, timeout=timeout_ms)
-        page.fill("input#j_password", password, timeout=timeout_ms)
-        page.click("button[name='loginbttn']", timeout=timeout_ms)
+# -----------------------------
+# Endpoints
+# -----------------------------
+# Point at another host (e.g. bench/mock_smartcredit.py) with SMARTCREDIT_BASE_URL
+SMARTCREDIT_BASE_URL = os.getenv("SMARTCREDIT_BASE_URL", "https://www.smartcredit.com").rstrip("/")
+ENDPOINTS = {
+    "search_results": f"{SMARTCREDIT_BASE_URL}/member/privacy/search-results",
+    "statistics": f"{SMARTCREDIT_BASE_URL}/member/privacy/search-result-statistics",
+    "trades": f"{SMARTCREDIT_BASE_URL}/member/money-manager/law/trades",
+    "credit_report_json": f"{SMARTCREDIT_BASE_URL}/member/credit-report/3b/simple.htm?format=JSON"
+}
+CREDIT_REPORT_HTML = f"{SMARTCREDIT_BASE_URL}/member/credit-report/smart-3b/"
+LOGIN_URL = f"{SMARTCREDIT_BASE_URL}/login"
+BUREAUS = ("TransUnion", "Experian", "Equifax")
+
+# Bureau -> CSS selector of the score on CREDIT_REPORT_HTML; override with SCORE_SELECTORS_JSON
+SCORE_SELECTORS = json.loads(os.getenv("SCORE_SELECTORS_JSON") or "null") or {
+    "TransUnion": "div.border-transunion h1.fw-bold",
+    "Experian": "div.border-experian h1.fw-bold",
+    "Equifax": "div.border-equifax h1.fw-bold",
+}
+SCORE_WAIT_MS = int(os.getenv("SCORE_WAIT_MS", "3000"))
 
-        try:
-            page.wait_for_url("**/member/**", timeout=timeout_ms)
-        except PWTimeout:
-            raise ValueError("Login failed or CAPTCHA required.")
+# Request interception: only these resource types / hosts are loaded (comma-separated env overrides)
+BLOCK_RESOURCES = os.getenv("BLOCK_RESOURCES", "true").lower() == "true"
+RESOURCE_ALLOWED_DOMAINS = os.getenv("RESOURCE_ALLOWED_DOMAINS", (urlsplit(SMARTCREDIT_BASE_URL).hostname or "").removeprefix("www."))
+LOGIN_RESOURCE_TYPES = os.getenv("LOGIN_RESOURCE_TYPES", "document,script,xhr,fetch")
+REPORT_RESOURCE_TYPES = os.getenv("REPORT_RESOURCE_TYPES", "document,script,xhr,fetch")
+MEMBER_PROBE_URL = f"{SMARTCREDIT_BASE_URL}/member/"
 
-        # --- Fetch JSON endpoints ---
-        for key, url in ENDPOINTS.items():
-            try:
-                resp = page.request.get(url, headers={"Accept": "application/json"})
-                if resp.ok:
-                    try:
-                        aggregated[key] = resp.json()
-                    except Exception:
-                        aggregated[key] = {"__raw_text": resp.text()}
-                else:
-                    aggregated[key] = {"__http_status": resp.status, "__error": resp.text()}
-            except Exception as e:
-                aggregated[key] = {"__error_exception": str(e)}
 
-        # --- Scrape HTML scores ---
+# -----------------------------
+# Browser Pool
+# -----------------------------
+class BrowserPool:
+    """Long-lived Chromium browsers shared across requests.
+
+    Playwright's sync API is bound to the thread that started it, so every
+    worker thread keeps its own driver and browser. Requests only pay for a
+    fresh BrowserContext (isolated cookies/storage), not a Chromium launch.
+    A browser is relaunched when it has disconnected or after serving
+    `max_contexts` contexts.
+    """
+
+    def __init__(self, max_contexts: int = BROWSER_MAX_CONTEXTS, launch_args=None):
+        self.max_contexts = max_contexts
+        self.launch_args = launch_args or ["--no-sandbox"]
+        self._local = threading.local()
+        self._lock = threading.Lock()
+        self._slots = []
+        self._closed = False
+
+    def _slot(self):
+        slot = getattr(self._local, "slot", None)
+        if slot is None:
+            slot = {"playwright": None, "browser": None, "served": 0, "thread": threading.current_thread()}
+            self._local.slot = slot
+            with self._lock:
+                self._slots.append(slot)
+        return slot
+
+    def _acquire(self):
+        if self._closed:
+            raise RuntimeError("Browser pool is shut down.")
+        slot = self._slot()
+        browser = slot["browser"]
+
+        # --- Health check / recycle ---
+        if browser is not None and (not browser.is_connected() or slot["served"] >= self.max_contexts):
+            self._close_slot(slot, stop_driver=False)
+            browser = None
+
+        if browser is None:
+            if slot["playwright"] is None:
+                slot["playwright"] = sync_playwright().start()
+            try:
+                browser = slot["playwright"].chromium.launch(headless=True, args=self.launch_args)
+            except Exception:
+                # Driver may have died with the old browser; restart it once
+                self._close_slot(slot, stop_driver=True)
+                slot["playwright"] = sync_playwright().start()
+                browser = slot["playwright"].chromium.launch(headless=True, args=self.launch_args)
+            slot["browser"] = browser
+            slot["served"] = 0
+
+        slot["served"] += 1
+        return browser
+
+    @contextmanager
+    def context(self, **context_kwargs):
+        """Yield a fresh BrowserContext from this thread's running browser."""
+        browser = self._acquire()
+        context = browser.new_context(**context_kwargs)
         try:
-            page.goto(CREDIT_REPORT_HTML, wait_until="domcontentloaded", timeout=timeout_ms)
-            tu = exp = eqf = None
+            yield context
+        finally:
             try:
-                tu = page.inner_text("div.border-transunion h1.fw-bold", timeout=3000).strip()
+                context.close()
             except Exception:
                 pass
+
+    @staticmethod
+    def _close_slot(slot, stop_driver: bool):
+        if slot["browser"] is not None:
             try:
-                exp = page.inner_text("div.border-experian h1.fw-bold", timeout=3000).strip()
+                slot["browser"].close()
             except Exception:
                 pass
+            slot["browser"] = None
+        if stop_driver and slot["playwright"] is not None:
             try:
-                eqf = page.inner_text("div.border-equifax h1.fw-bold", timeout=3000).strip()
+                slot["playwright"].stop()
             except Exception:
                 pass
+            slot["playwright"] = None
 
-            if tu:
-                scores["TransUnion"] = tu
-            if exp:
-                scores["Experian"] = exp
-            if eqf:
-                scores["Equifax"] = eqf
-        except Exception:
-            pass
+    def shutdown(self):
+        """Close every browser and driver. Safe to call more than once."""
+        self._closed = True
+        with self._lock:
+            slots, self._slots = self._slots, []
+        for slot in slots:
+            # Sync Playwright objects can only be driven from their own thread;
+            # browsers owned by other threads die with the driver process.
+            if slot["thread"] is threading.current_thread() or not slot["thread"].is_alive():
+                self._close_slot(slot, stop_driver=True)
 
-        browser.close()
 
-    return {"aggregated": aggregated, "scores": scores}
+browser_pool = BrowserPool()
+atexit.register(browser_pool.shutdown)
 
 
 # -----------------------------
-# Normalize Report
+# Resource Blocking
 # -----------------------------
-def normalize_report(raw: dict, scores: dict):
-    """Normalize raw SmartCredit JSON into client’s expected structure."""
+def _csv_set(value: str) -> frozenset:
+    return frozenset(v.strip().lower() for v in value.split(",") if v.strip())
+
+
+class ResourcePolicy:
+    """Allowlist of resource types and host domains a page may load; everything else is aborted."""
+
+    def __init__(self, allowed_types, allowed_domains):
+        self.allowed_types = frozenset(allowed_types)
+        self.allowed_domains = frozenset(allowed_domains)
 
-    def safe_number(val):
+    def allows(self, resource_type: str, url: str) -> bool:
+        if resource_type not in self.allowed_types:
+            return False
+        host = (urlsplit(url).hostname or "").lower()
+        if not host:
+            return True  # data:, blob: and friends never leave the browser
+        return any(host == d or host.endswith("." + d) for d in self.allowed_domains)
+
+    def handle(self, route):
+        if self.allows(route.request.resource_type, route.request.url):
+            route.continue_()
+        else:
+            route.abort()
+
+    def apply(self, target):
+        """Install on a BrowserContext, or on a Page to override the context policy."""
+        if BLOCK_RESOURCES:
+            target.route("**/*", self.handle)
+
+
+LOGIN_RESOURCE_POLICY = ResourcePolicy(_csv_set(LOGIN_RESOURCE_TYPES), _csv_set(RESOURCE_ALLOWED_DOMAINS))
+REPORT_RESOURCE_POLICY = ResourcePolicy(_csv_set(REPORT_RESOURCE_TYPES), _csv_set(RESOURCE_ALLOWED_DOMAINS))
+
+
+# -----------------------------
+# Session Cache
+# -----------------------------
+def credential_key(email: str, password: str) -> str:
+    """Keyed hash identifying a credential pair without storing it."""
+    message = f"{email.strip().lower()}\0{password}".encode("utf-8")
+    return hmac.new(CREDENTIAL_HASH_SECRET.encode("utf-8"), message, hashlib.sha256).hexdigest()
+
+
+class SessionCache:
+    """Encrypted, TTL-bound cache of Playwright storage states.
+
+    Storage states hold live session cookies, so entries are kept Fernet
+    encrypted and keyed by `credential_key`, never by the raw email.
+    """
+
+    def __init__(self, ttl: int = SESSION_CACHE_TTL, max_entries: int = SESSION_CACHE_MAX_ENTRIES, key=SESSION_CACHE_KEY):
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self._fernet = Fernet(key or Fernet.generate_key())
+        self._entries = {}
+        self._lock = threading.Lock()
+
+    def get(self, cache_key: str):
+        with self._lock:
+            entry = self._entries.get(cache_key)
+            if entry and entry[0] <= time.monotonic():
+                del self._entries[cache_key]
+                entry = None
+        if not entry:
+            return None
         try:
-            if val is None or val == "":
-                return None
-            return float(val)
-        except (TypeError, ValueError):
+            return json.loads(self._fernet.decrypt(entry[1]))
+        except (InvalidToken, ValueError):
+            self.invalidate(cache_key)
             return None
 
-    def safe_string(val):
-        if val is None:
-            return None
-        return str(val).strip() if str(val).strip() else None
+    def put(self, cache_key: str, storage_state: dict):
+        if self.ttl <= 0:
+            return
+        token = self._fernet.encrypt(json.dumps(storage_state).encode("utf-8"))
+        now = time.monotonic()
+        with self._lock:
+            if len(self._entries) >= self.max_entries:
+                for k in [k for k, (exp, _) in self._entries.items() if exp <= now]:
+                    del self._entries[k]
+                while len(self._entries) >= self.max_entries:
+                    # Dicts keep insertion order, so this drops the oldest login
+                    del self._entries[next(iter(self._entries))]
+            self._entries[cache_key] = (now + self.ttl, token)
 
-    normalized = {
-        "personal_info": {},
-        "scores": scores or {},
-        "accounts": [],
-        "inquiries": [],
-        "public_records": [],
-        "employers": []
+    def invalidate(self, cache_key: str):
+        with self._lock:
+            self._entries.pop(cache_key, None)
+
+
+session_cache = SessionCache()
+
+
+class ExpiringKeys:
+    """Set of credential keys that each expire `ttl` seconds after being added."""
+
+    def __init__(self, ttl: int, max_entries: int = SESSION_CACHE_MAX_ENTRIES):
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self._entries = {}
+        self._lock = threading.Lock()
+
+    def __contains__(self, cache_key: str) -> bool:
+        with self._lock:
+            expires = self._entries.get(cache_key)
+            if expires is not None and expires <= time.monotonic():
+                del self._entries[cache_key]
+                expires = None
+        return expires is not None
+
+    def add(self, cache_key: str):
+        if self.ttl <= 0:
+            return
+        with self._lock:
+            self._entries.pop(cache_key, None)
+            while len(self._entries) >= self.max_entries:
+                del self._entries[next(iter(self._entries))]  # oldest first
+            self._entries[cache_key] = time.monotonic() + self.ttl
+
+    def discard(self, cache_key: str):
+        with self._lock:
+            self._entries.pop(cache_key, None)
+
+
+# Credentials whose http form login fell back recently; they go straight to the next strategy
+http_login_skips = ExpiringKeys(HTTP_LOGIN_SKIP_TTL)
+
+
+# -----------------------------
+# Fetch Report
+# -----------------------------
+def _playwright_login(page, email: str, password: str, timeout_ms: int):
+    page.goto(LOGIN_URL, wait_until="domcontentloaded", timeout=timeout_ms)
+    page.fill("input#j_username", email, timeout=timeout_ms)
+    page.fill("input#j_password", password, timeout=timeout_ms)
+    page.click("button[name='loginbttn']", timeout=timeout_ms)
+
+    try:
+        page.wait_for_url("**/member/**", timeout=timeout_ms)
+    except PWTimeout:
+        raise ValueError("Login failed or CAPTCHA required.")
+
+
+def _probe_session(page, timeout_ms: int) -> bool:
+    """True if the context's cookies still reach the member area."""
+    try:
+        page.goto(MEMBER_PROBE_URL, wait_until="domcontentloaded", timeout=timeout_ms)
+    except Exception:
+        return False
+    return "/member/" in page.url
+
+
+# Runs inside the logged-in page so every fetch carries the session cookies.
+# A small worker pool bounds concurrency; each fetch has its own abort timer.
+_FETCH_ENDPOINTS_JS = """
+async ({endpoints, limit, timeoutMs}) => {
+    const entries = Object.entries(endpoints);
+    const results = {};
+    let next = 0;
+    async function worker() {
+        while (next < entries.length) {
+            const [key, url] = entries[next++];
+            const controller = new AbortController();
+            const timer = setTimeout(() => controller.abort(), timeoutMs);
+            const started = performance.now();
+            try {
+                const resp = await fetch(url, {
+                    headers: {"Accept": "application/json"},
+                    credentials: "include",
+                    signal: controller.signal,
+                });
+                results[key] = {ok: resp.ok, status: resp.status, text: await resp.text()};
+            } catch (e) {
+                results[key] = {error: controller.signal.aborted ? `timeout after ${timeoutMs}ms` : String(e)};
+            } finally {
+                clearTimeout(timer);
+                results[key].ms = performance.now() - started;
+            }
+        }
     }
+    await Promise.all(Array.from({length: Math.min(limit, entries.length)}, worker));
+    return results;
+}
+"""
 
-    # --- Parse rawReport for reuse in multiple sections ---
-    cr_json = raw.get("credit_report_json", {})
-    raw_report_str = None
-    borrower = None
-    true_link = None
-    
-    if isinstance(cr_json, dict):
-        # Check if the personal info is in rawReport as a JSON string
-        raw_report_str = cr_json.get("rawReport")
-        
+
+def _endpoint_result(ok: bool, status: int, text: str):
+    """Wrap one endpoint response in the envelope the API has always returned."""
+    if ok:
+        try:
+            return json.loads(text)
+        except ValueError:
+            return {"__raw_text": text}
+    return {"__http_status": status, "__error": text}
+
+
+def _record_endpoint(timer, key: str, status, seconds: float):
+    metrics.inc("smartcredit_endpoint_responses_total", endpoint=key, status=str(status or "error"))
+    if timer is not None:
+        timer.record(f"endpoint.{key}", seconds)
+
+
+def fetch_endpoints(page, endpoints: dict, concurrency: int = ENDPOINT_CONCURRENCY, timeout_ms: int = ENDPOINT_TIMEOUT_MS,
+                    timer: StageTimer = None):
+    """Fetch all endpoints concurrently from the authenticated page."""
+    try:
+        results = page.evaluate(_FETCH_ENDPOINTS_JS, {
+            "endpoints": endpoints,
+            "limit": max(1, concurrency),
+            "timeoutMs": timeout_ms,
+        })
+    except Exception as e:
+        return {key: {"__error_exception": str(e)} for key in endpoints}
+
+    aggregated = {}
+    for key in endpoints:
+        res = results.get(key) or {"error": "no result"}
+        _record_endpoint(timer, key, res.get("status"), res.get("ms", 0) / 1000)
+        if "error" in res:
+            aggregated[key] = {"__error_exception": res["error"]}
+        else:
+            aggregated[key] = _endpoint_result(res["ok"], res["status"], res["text"])
+    return aggregated
+
+
+_SCRAPE_SCORES_JS = """
+(selectors) => {
+    const found = {};
+    for (const [bureau, selector] of Object.entries(selectors)) {
+        const el = document.querySelector(selector);
+        const text = el && el.innerText.trim();
+        if (text) found[bureau] = text;
+    }
+    return found;
+}
+"""
+
+
+def scrape_scores(page, selectors: dict = SCORE_SELECTORS, wait_ms: int = SCORE_WAIT_MS) -> dict:
+    """Read every bureau score present on the page in one round-trip."""
+    try:
+        # One shared wait for any score element instead of one timeout per bureau
+        page.wait_for_selector(", ".join(selectors.values()), state="attached", timeout=wait_ms)
+    except PWTimeout:
+        return _record_score_misses({}, selectors)
+    return _record_score_misses(page.evaluate(_SCRAPE_SCORES_JS, selectors), selectors)
+
+
+def _record_score_misses(found: dict, selectors: dict) -> dict:
+    for bureau in selectors:
+        if bureau not in found:
+            metrics.inc("smartcredit_score_scrape_misses_total", bureau=bureau)
+    return found
+
+
+# -----------------------------
+# Browserless HTTP fetch
+# -----------------------------
+# One connection pool shared by every per-user session. Sessions are never
+# close()d, since that would close this shared adapter.
+_http_adapter = HTTPAdapter(pool_connections=4, pool_maxsize=HTTP_POOL_MAXSIZE, max_retries=0)
+_http_fetch_executor = ThreadPoolExecutor(max_workers=HTTP_FETCH_WORKERS, thread_name_prefix="http-fetch")
+atexit.register(_http_fetch_executor.shutdown, wait=False)
+
+
+def http_session(cookies: list, user_agent: str = None) -> requests.Session:
+    """requests.Session carrying a browser context's cookies over the shared connection pool."""
+    session = requests.Session()
+    session.mount("https://", _http_adapter)
+    session.mount("http://", _http_adapter)
+    if user_agent:
+        session.headers["User-Agent"] = user_agent
+    for cookie in cookies:
+        session.cookies.set(cookie["name"], cookie["value"], domain=cookie.get("domain"), path=cookie.get("path", "/"))
+    return session
+
+
+def _http_get_endpoint(session: requests.Session, url: str, timeout_ms: int):
+    """(envelope, HTTP status or None, seconds) for one endpoint."""
+    start = time.perf_counter()
+    try:
+        resp = session.get(url, headers={"Accept": "application/json"}, timeout=timeout_ms / 1000)
+        return _endpoint_result(resp.ok, resp.status_code, resp.text), resp.status_code, time.perf_counter() - start
+    except Exception as e:
+        return {"__error_exception": str(e)}, None, time.perf_counter() - start
+
+
+def fetch_endpoints_http(session: requests.Session, endpoints: dict, timeout_ms: int = ENDPOINT_TIMEOUT_MS,
+                         timer: StageTimer = None):
+    """Fetch all endpoints concurrently over keep-alive HTTP, same envelopes as fetch_endpoints."""
+    futures = {key: _http_fetch_executor.submit(_http_get_endpoint, session, url, timeout_ms) for key, url in endpoints.items()}
+    aggregated = {}
+    for key, future in futures.items():
+        aggregated[key], status, seconds = future.result()
+        _record_endpoint(timer, key, status, seconds)
+    return aggregated
+
+
+def scrape_scores_html(html: str, selectors: dict = SCORE_SELECTORS) -> dict:
+    """Bureau scores from server-rendered smart-3b HTML (no JavaScript runs here)."""
+    soup = BeautifulSoup(html, "lxml")
+    found = {}
+    for bureau, selector in selectors.items():
+        el = soup.select_one(selector)
+        text = el.get_text(strip=True) if el else None
+        if text:
+            found[bureau] = text
+    return _record_score_misses(found, selectors)
+
+
+# -----------------------------
+# Report Fetch Flow
+# -----------------------------
+def _missing_json_scores(aggregated: dict):
+    """Parse credit_report_json once; returns (report, True if some bureau needs the HTML scrape)."""
+    cr_json = aggregated.get("credit_report_json")
+    report = ParsedReport(cr_json)
+    json_scores = scores_from_credit_report(cr_json, report.borrower if report.has_raw_report else None)
+    return report, not all(b in json_scores for b in BUREAUS)
+
+
+# Output section -> ENDPOINTS its normalizer reads; "scores" may also need the smart-3b page
+SECTION_ENDPOINTS = {
+    "scores": ("credit_report_json",),
+    "personal_info": ("credit_report_json",),
+    "accounts": ("trades", "credit_report_json"),
+    "inquiries": ("search_results", "credit_report_json"),
+    "public_records": ("search_results",),
+    "employers": ("credit_report_json",),
+}
+
+
+def fetch_plan(sections=None) -> dict:
+    """
+    What to fetch for `sections` (None = the full report, every ENDPOINT).
+    "endpoints" are fetched up front; "deferred" ones only when the smart-3b
+    page is missing a bureau score, so a scores-only request tries the HTML
+    before downloading the multi-megabyte credit_report_json.
+    """
+    if sections is None:
+        return {"endpoints": dict(ENDPOINTS), "deferred": {}, "scores": True}
+    keys = {key for section in sections if section != "scores" for key in SECTION_ENDPOINTS[section]}
+    deferred = {}
+    if "scores" in sections and "credit_report_json" not in keys:
+        deferred = {"credit_report_json": ENDPOINTS["credit_report_json"]}
+    return {
+        "endpoints": {key: url for key, url in ENDPOINTS.items() if key in keys},
+        "deferred": deferred,
+        "scores": "scores" in sections,
+    }
+
+
+def _collect(fetch_json, scrape_html, plan: dict, timer: StageTimer) -> dict:
+    """
+    Run a fetch plan with one transport's fetch_json(endpoints) and
+    scrape_html() callables: the planned endpoints, then the smart-3b scores
+    if the JSON is missing a bureau, then any deferred endpoints still needed.
+    """
+    aggregated = {}
+    scores = {}
+    if plan["endpoints"]:
+        with timer.stage("endpoints"):
+            aggregated.update(fetch_json(plan["endpoints"]))
+    with timer.stage("parse"):
+        report, needs_html = _missing_json_scores(aggregated)
+
+    if plan["scores"] and needs_html:
+        try:
+            with timer.stage("smart3b"):
+                scores.update(scrape_html())
+        except Exception:
+            pass
+        if plan["deferred"] and not all(b in scores for b in BUREAUS):
+            with timer.stage("endpoints"):
+                aggregated.update(fetch_json(plan["deferred"]))
+            with timer.stage("parse"):
+                report, _ = _missing_json_scores(aggregated)
+    return {"aggregated": aggregated, "scores": scores, "report": report}
+
+
+def _fetch_over_http(session: requests.Session, timeout_ms: int, timer: StageTimer, plan: dict) -> dict:
+    """Run the fetch plan over an authenticated requests.Session."""
+    def scrape_html():
+        resp = session.get(CREDIT_REPORT_HTML, timeout=timeout_ms / 1000)
+        return scrape_scores_html(resp.text) if resp.ok else {}
+
+    return _collect(lambda endpoints: fetch_endpoints_http(session, endpoints, timer=timer), scrape_html, plan, timer)
+
+
+class LoginFallback(Exception):
+    """A login strategy cannot complete this login (bot protection, unexpected page); try the next one."""
+
+
+class HttpLoginStrategy:
+    """Log in with a direct form POST and fetch everything over HTTP; no browser involved."""
+
+    name = "http"
+    BOT_PROTECTION_MARKERS = ("captcha", "cf-challenge", "cf-chl", "_incapsula_", "px-block", "are you a robot")
+    ERROR_SELECTORS = ".alert-danger, .login-error, #loginError, .error-message"
+
+    def fetch_report(self, email: str, password: str, timeout_ms: int, fetch_mode: str, timer: StageTimer, plan: dict) -> dict:
+        cache_key = credential_key(email, password)
+        with timer.stage("login"):
+            session, login_path = self._cached_session(cache_key, timeout_ms), "http-cached"
+            if session is None:
+                if cache_key in http_login_skips:
+                    raise LoginFallback("http login fell back recently; skipped")
+                try:
+                    session, login_path = self._login(email, password, timeout_ms), "http"
+                except LoginFallback:
+                    http_login_skips.add(cache_key)
+                    raise
+                http_login_skips.discard(cache_key)
+                session_cache.put(cache_key, self._storage_state(session))
+
+        result = _fetch_over_http(session, timeout_ms, timer, plan)
+        result["login_path"] = login_path
+        return result
+
+    def _cached_session(self, cache_key: str, timeout_ms: int):
+        storage_state = session_cache.get(cache_key)
+        if not storage_state:
+            return None
+        session = http_session(storage_state.get("cookies", []), HTTP_USER_AGENT)
+        try:
+            resp = session.get(MEMBER_PROBE_URL, timeout=timeout_ms / 1000)
+        except requests.RequestException:
+            return None
+        if resp.ok and "/member/" in urlsplit(resp.url).path:
+            return session
+        session_cache.invalidate(cache_key)
+        return None
+
+    def _bot_protected(self, resp) -> bool:
+        if resp.status_code in (403, 429):
+            return True
+        text = resp.text.lower()
+        return any(marker in text for marker in self.BOT_PROTECTION_MARKERS)
+
+    def _login(self, email: str, password: str, timeout_ms: int) -> requests.Session:
+        session = http_session([], HTTP_USER_AGENT)
+        timeout = timeout_ms / 1000
+        try:
+            resp = session.get(LOGIN_URL, timeout=timeout)
+        except requests.RequestException as e:
+            raise LoginFallback(f"login page unreachable: {e}")
+        if self._bot_protected(resp):
+            raise LoginFallback("bot protection on login page")
+
+        # Post the real form back, hidden fields (CSRF tokens etc.) included
+        soup = BeautifulSoup(resp.text, "lxml")
+        user_input = soup.select_one("input#j_username")
+        pass_input = soup.select_one("input#j_password")
+        form = user_input.find_parent("form") if user_input else None
+        if form is None or pass_input is None:
+            raise LoginFallback("login form not found")
+
+        data = {
+            field["name"]: field.get("value", "")
+            for field in form.select("input[name]")
+            if field.get("type") not in ("checkbox", "radio") or field.has_attr("checked")
+        }
+        data[user_input.get("name", "j_username")] = email
+        data[pass_input.get("name", "j_password")] = password
+        button = form.select_one("button[name='loginbttn']")
+        if button is not None:
+            data[button["name"]] = button.get("value", "")
+
+        action = urljoin(resp.url, form.get("action") or resp.url)
+        try:
+            resp = session.post(action, data=data, timeout=timeout)
+        except requests.RequestException as e:
+            raise LoginFallback(f"login POST failed: {e}")
+        if self._bot_protected(resp):
+            raise LoginFallback("bot protection after login POST")
+        if self._credentials_rejected(resp):
+            # Wrong email/password: another strategy would only repeat the failed attempt
+            raise ValueError("Login failed: invalid email or password.")
+        if "/member/" not in urlsplit(resp.url).path:
+            raise LoginFallback("login POST did not land on /member/")
+        return session
+
+    def _credentials_rejected(self, resp) -> bool:
+        """Back on the login page with an error (`?error` redirect or an error message next to the form)."""
+        url = urlsplit(resp.url)
+        if url.path.rstrip("/") != urlsplit(LOGIN_URL).path.rstrip("/"):
+            return False
+        if "error" in parse_qs(url.query, keep_blank_values=True):
+            return True
+        soup = BeautifulSoup(resp.text, "lxml")
+        return soup.select_one("input#j_username") is not None and any(
+            el.get_text(strip=True) for el in soup.select(self.ERROR_SELECTORS))
+
+    @staticmethod
+    def _storage_state(session: requests.Session) -> dict:
+        """Session cookies in Playwright storage-state form, so either strategy can reuse them."""
+        cookies = [{
+            "name": c.name,
+            "value": c.value,
+            "domain": c.domain,
+            "path": c.path or "/",
+            "expires": c.expires if c.expires else -1,
+            "httpOnly": c.has_nonstandard_attr("HttpOnly"),
+            "secure": bool(c.secure),
+            "sameSite": "Lax",
+        } for c in session.cookies]
+        return {"cookies": cookies, "origins": []}
+
+
+class PlaywrightLoginStrategy:
+    """Log in through the pooled browser; works for accounts the HTTP form POST cannot handle."""
+
+    name = "playwright"
+
+    def fetch_report(self, email: str, password: str, timeout_ms: int, fetch_mode: str, timer: StageTimer, plan: dict) -> dict:
+        cache_key = credential_key(email, password)
+        storage_state = session_cache.get(cache_key)
+        login_path = "playwright-cached"
+
+        with browser_pool.context(storage_state=storage_state) as context:
+            LOGIN_RESOURCE_POLICY.apply(context)
+            page = context.new_page()
+
+            # --- Login (skipped while a cached session is still valid) ---
+            with timer.stage("login"):
+                if not (storage_state and _probe_session(page, timeout_ms)):
+                    if storage_state:
+                        session_cache.invalidate(cache_key)
+                    _playwright_login(page, email, password, timeout_ms)
+                    session_cache.put(cache_key, context.storage_state())
+                    login_path = "playwright"
+
+            if fetch_mode == "http":
+                session = http_session(context.cookies(), page.evaluate("navigator.userAgent"))
+            else:
+                # --- Fetch JSON endpoints in the page; smart-3b HTML scores only when the JSON lacks a bureau ---
+                def scrape_html():
+                    REPORT_RESOURCE_POLICY.apply(page)
+                    page.goto(CREDIT_REPORT_HTML, wait_until="domcontentloaded", timeout=timeout_ms)
+                    return scrape_scores(page)
+
+                result = _collect(lambda endpoints: fetch_endpoints(page, endpoints, timer=timer), scrape_html, plan, timer)
+
+        if fetch_mode == "http":
+            # Browser context is closed by now; only cookies are needed from here on
+            result = _fetch_over_http(session, timeout_ms, timer, plan)
+        result["login_path"] = login_path
+        return result
+
+
+LOGIN_STRATEGY_REGISTRY = {strategy.name: strategy for strategy in (HttpLoginStrategy(), PlaywrightLoginStrategy())}
+
+
+def fetch_report_for_credentials(email: str, password: str, headless: bool = PLAYWRIGHT_HEADLESS, timeout_ms: int = REQUEST_TIMEOUT_MS,
+                                 fetch_mode: str = FETCH_MODE, login_strategies=None, timer: StageTimer = None, sections=None):
+    """
+    Log in and collect the ENDPOINTS payloads plus any HTML scores.
+    Login strategies are tried in order (LOGIN_STRATEGIES, default http then
+    playwright); a strategy raising LoginFallback hands over to the next one.
+    fetch_mode "browser" fetches inside the page; "http" hands the session
+    cookies to a pooled requests.Session and closes the browser context
+    right after login. `sections` limits the fetch to what those output
+    sections need (see fetch_plan). The result's "login_path" records which
+    path ran and "timings" the seconds spent per stage.
+    """
+    timer = timer or StageTimer()
+    plan = fetch_plan(sections)
+    names = login_strategies or LOGIN_STRATEGIES
+    fallbacks = []
+    for name in names:
+        try:
+            result = LOGIN_STRATEGY_REGISTRY[name].fetch_report(email, password, timeout_ms, fetch_mode, timer, plan)
+        except LoginFallback as e:
+            fallbacks.append(f"{name}: {e}")
+            metrics.inc("smartcredit_login_fallbacks_total", strategy=name)
+            continue
+        metrics.inc("smartcredit_logins_total", path=result["login_path"])
+        result["login_fallbacks"] = fallbacks
+        result["timings"] = timer.stages
+        if sections is None:
+            store_raw_fetch(credential_key(email, password), result["aggregated"], result["scores"])
+        return result
+    raise ValueError(f"Login failed or CAPTCHA required ({'; '.join(fallbacks)}).")
+
+
+class SingleFlight:
+    """One call per key at a time; callers arriving while it runs wait for it and share its result (or exception)."""
+
+    def __init__(self):
+        self._calls = {}
+        self._lock = threading.Lock()
+
+    def do(self, key: str, fn):
+        with self._lock:
+            call = self._calls.get(key)
+            leader = call is None
+            if leader:
+                call = self._calls[key] = Future()
+        if not leader:
+            return call.result()
+        try:
+            result = fn()
+        except BaseException as e:
+            call.set_exception(e)
+            raise
+        else:
+            call.set_result(result)
+            return result
+        finally:
+            with self._lock:
+                del self._calls[key]
+
+
+fetch_flights = SingleFlight()
+
+
+def fetch_flight_key(email: str, password: str, sections=None) -> str:
+    """Single-flight key of an upstream fetch: credential and sections only, since the output options do not change it."""
+    return report_cache_key(email, password, sections=sections) + ":fetch"
+
+
+def fetch_report_shared(email: str, password: str, headless: bool = PLAYWRIGHT_HEADLESS, timer: StageTimer = None, sections=None):
+    """
+    fetch_report_for_credentials, coalesced per fetch_flight_key: JSON and
+    NDJSON requests, and every schema, share one login while it is running.
+    """
+    return fetch_flights.do(
+        fetch_flight_key(email, password, sections),
+        lambda: fetch_report_for_credentials(email, password, headless=headless, timer=timer, sections=sections),
+    )
+
+
+# -----------------------------
+# Normalize Report
+# -----------------------------
+# BundleComponent keys normalization reads; True keeps the whole subtree
+RAW_REPORT_KEEP = {
+    "Type": True,
+    "TrueLinkCreditReportType": {"Borrower": True, "TradeLinePartition": True, "InquiryPartition": True},
+    "CreditReportType": {"Tradeline": True, "Trade": True, "Account": True},
+}
+RAW_REPORT_ERRORS = (json.JSONDecodeError, AttributeError, TypeError) + ((ijson.JSONError,) if ijson else ())
+
+
+class _TextReader:
+    """File-like view of a str for ijson: encodes a chunk per read() instead of the whole string at once."""
+
+    def __init__(self, text: str, chunk_chars: int = 64 * 1024):
+        self.text = text
+        self.chunk_chars = chunk_chars
+        self.pos = 0
+
+    def read(self, size: int = -1) -> bytes:
+        size = self.chunk_chars if size is None or size < 0 else min(size, self.chunk_chars)
+        chunk = self.text[self.pos:self.pos + size]
+        self.pos += len(chunk)
+        return chunk.encode("utf-8")
+
+
+def _read_value(events, event, value, keys: dict):
+    """Build the value that starts with (event, value); `keys` dedupes map keys the way json.loads does."""
+    if event == "start_map":
+        obj = {}
+        for event, key in events:
+            if event == "end_map":
+                return obj
+            event, value = next(events)
+            obj[keys.setdefault(key, key)] = _read_value(events, event, value, keys)
+    elif event == "start_array":
+        items = []
+        for event, value in events:
+            if event == "end_array":
+                return items
+            items.append(_read_value(events, event, value, keys))
+    return value
+
+
+def _skip_value(events, event):
+    """Consume the value that starts with `event` without building it."""
+    if event not in ("start_map", "start_array"):
+        return
+    depth = 1
+    for event, _ in events:
+        if event in ("start_map", "start_array"):
+            depth += 1
+        elif event in ("end_map", "end_array"):
+            depth -= 1
+            if not depth:
+                return
+
+
+def _read_kept(events, spec: dict, keys: dict) -> dict:
+    """Build the map whose start_map was just read, keeping only the keys in `spec` (see RAW_REPORT_KEEP)."""
+    obj = {}
+    for event, key in events:
+        if event == "end_map":
+            return obj
+        event, value = next(events)
+        keep = spec.get(key)
+        if keep is None:
+            _skip_value(events, event)
+        elif isinstance(keep, dict) and event == "start_map":
+            obj[key] = _read_kept(events, keep, keys)
+        else:
+            obj[key] = _read_value(events, event, value, keys)
+    return obj
+
+
+def iter_raw_report_components(raw_report: str):
+    """
+    Yield the rawReport's BundleComponents one at a time, each holding only
+    the RAW_REPORT_KEEP keys. Parsed incrementally with ijson: everything
+    else is skipped as it is read, so peak memory follows what normalization
+    keeps rather than the size of the whole blob.
+    """
+    events = iter(ijson.basic_parse(_TextReader(raw_report), use_float=True))
+    keys = {}
+    if next(events, (None, None))[0] != "start_map":
+        return
+    for event, key in events:  # top-level keys
+        if event == "end_map":
+            return
+        event, _ = next(events)
+        if key != "BundleComponents" or event != "start_map":
+            _skip_value(events, event)
+            continue
+        for event, key in events:  # BundleComponents keys
+            if event == "end_map":
+                break
+            event, _ = next(events)
+            if key == "BundleComponent" and event == "start_map":
+                yield _read_kept(events, RAW_REPORT_KEEP, keys)
+            elif key == "BundleComponent" and event == "start_array":
+                for event, _ in events:
+                    if event == "end_array":
+                        break
+                    if event == "start_map":
+                        yield _read_kept(events, RAW_REPORT_KEEP, keys)
+                    else:
+                        _skip_value(events, event)
+            else:
+                _skip_value(events, event)
+
+
+def _stream_raw_report(raw_report_str) -> bool:
+    if ijson is None or not isinstance(raw_report_str, str) or RAW_REPORT_PARSER == "json":
+        return False
+    return RAW_REPORT_PARSER == "stream" or len(raw_report_str) >= RAW_REPORT_STREAM_MIN_BYTES
+
+
+class ParsedReport:
+    """
+    credit_report_json parsed once per request.
+    The rawReport string is decoded a single time and its BundleComponents
+    indexed by Type; every normalization section reads from this object.
+    Large rawReports (see RAW_REPORT_PARSER) are parsed incrementally, keeping
+    only the RAW_REPORT_KEEP parts of each component.
+    """
+
+    BUREAU_REPORT_TYPES = {"TUCReportV6": "TUC", "EQFReportV6": "EQF", "EXPReportV6": "EXP"}
+
+    def __init__(self, cr_json):
+        self.cr_json = cr_json if isinstance(cr_json, dict) else {}
+        self.has_raw_report = False
+        self.components = {}  # Type -> [BundleComponent, ...] of the rawReport
+        self.bureau_reports = []  # (bureau symbol, BundleComponent) in report order
+        self.true_link = None
+        self.borrower = None
+
+        raw_report_str = self.cr_json.get("rawReport")
         if raw_report_str:
+            self.has_raw_report = True
             try:
-                # Parse the JSON string
-                import json
-                raw_report_data = json.loads(raw_report_str)
-                
-                # Navigate to the borrower data in the parsed structure
-                bundle_components = raw_report_data.get("BundleComponents", {})
-                if isinstance(bundle_components, dict):
-                    bundle_component_list = bundle_components.get("BundleComponent", [])
-                    if isinstance(bundle_component_list, dict):
-                        bundle_component_list = [bundle_component_list]
-                    
-                    # Look for the MergeCreditReports type which contains borrower info
-                    for comp in bundle_component_list:
-                        if comp.get("Type") == "MergeCreditReports":
-                            true_link = comp.get("TrueLinkCreditReportType", {})
-                            borrower = true_link.get("Borrower", {})
-                            break
-                            
-            except (json.JSONDecodeError, AttributeError, TypeError) as e:
+                if _stream_raw_report(raw_report_str):
+                    components = list(iter_raw_report_components(raw_report_str))
+                else:
+                    components = self._bundle_components(json.loads(raw_report_str))
+                self._index(components)
+            except RAW_REPORT_ERRORS as e:
                 print(f"Warning: Could not parse rawReport JSON: {e}")
 
-    # --- Personal Info ---
-    if isinstance(cr_json, dict):
-                
         # Fallback: try the original structure in case it's sometimes parsed
-        if not borrower:
-            bundle_components = cr_json.get("BundleComponents", {})
-            if isinstance(bundle_components, dict):
-                bundle_component_list = bundle_components.get("BundleComponent", [])
-                if isinstance(bundle_component_list, dict):
-                    bundle_component_list = [bundle_component_list]
-                
-                # Look for the MergeCreditReports type which contains borrower info
-                for comp in bundle_component_list:
-                    if comp.get("Type") == "MergeCreditReports":
-                        true_link = comp.get("TrueLinkCreditReportType", {})
-                        borrower = true_link.get("Borrower", {})
-                        break
-        
+        if not self.borrower:
+            merged = self._bundle_components(self.cr_json)
+            for comp in merged:
+                if comp.get("Type") == "MergeCreditReports":
+                    self._set_true_link(comp)
+                    break
+
+    @classmethod
+    def from_raw(cls, raw: dict):
+        return cls(raw.get("credit_report_json"))
+
+    @staticmethod
+    def _bundle_components(report: dict) -> list:
+        bundle_components = report.get("BundleComponents", {})
+        if not isinstance(bundle_components, dict):
+            return []
+        bundle_component_list = bundle_components.get("BundleComponent", [])
+        if isinstance(bundle_component_list, dict):
+            bundle_component_list = [bundle_component_list]
+        return bundle_component_list
+
+    def _set_true_link(self, comp: dict):
+        self.true_link = comp.get("TrueLinkCreditReportType", {})
+        self.borrower = self.true_link.get("Borrower", {})
+
+    def _index(self, components):
+        for comp in components:
+            comp_type = comp.get("Type")
+            self.components.setdefault(comp_type, []).append(comp)
+            if comp_type == "MergeCreditReports" and self.true_link is None:
+                self._set_true_link(comp)
+            elif comp_type in self.BUREAU_REPORT_TYPES:
+                self.bureau_reports.append((self.BUREAU_REPORT_TYPES[comp_type], comp))
+
+
+BUREAU_SYMBOLS = {"TUC": "TransUnion", "EQF": "Equifax", "EXP": "Experian"}
+
+
+def _bureau_key(bureau) -> str:
+    """Canonical bureau name for index keys ("TUC", "TransUnion", "transunion" -> "transunion")."""
+    bureau = str(bureau or "").strip()
+    return BUREAU_SYMBOLS.get(bureau.upper(), bureau).lower()
+
+
+def _merge_missing(target: dict, source: dict):
+    """Fill fields that are empty on `target` from `source`, recursing into nested dicts."""
+    for key, value in source.items():
+        if value is None:
+            continue
+        current = target.get(key)
+        if current is None:
+            target[key] = value
+        elif isinstance(current, dict) and isinstance(value, dict):
+            _merge_missing(current, value)
+
+
+def scores_from_credit_report(cr_json, borrower=None) -> dict:
+    """Bureau scores carried by the report JSON (BundleComponents, then Borrower.CreditScore)."""
+    scores = {}
+    if not isinstance(cr_json, dict):
+        return scores
+
+    # VantageScore components in BundleComponents
+    comps = (cr_json.get("BundleComponents") or {}).get("BundleComponent", [])
+    if isinstance(comps, dict):
+        comps = [comps]
+    for comp in comps:
+        bureau = comp.get("Type")
+        cs = comp.get("CreditScoreType") or {}
+        score = cs.get("riskScore") or cs.get("score")
+        if score and bureau:
+            if "TUC" in bureau:
+                scores["TransUnion"] = score
+            elif "EQF" in bureau:
+                scores["Equifax"] = score
+            elif "EXP" in bureau:
+                scores["Experian"] = score
+
+    # CreditScore array on the MergeCreditReports borrower
+    if borrower:
+        try:
+            credit_scores = borrower.get("CreditScore", [])
+            if isinstance(credit_scores, list):
+                for credit_score in credit_scores:
+                    score_value = credit_score.get("riskScore")
+                    source = credit_score.get("Source", {})
+                    bureau_info = source.get("Bureau", {})
+                    bureau_symbol = bureau_info.get("symbol")
+                    bureau_name = bureau_info.get("description")
+
+                    if score_value and bureau_symbol:
+                        if bureau_symbol == "TUC" or (bureau_name and "TransUnion" in bureau_name):
+                            scores["TransUnion"] = score_value
+                        elif bureau_symbol == "EQF" or (bureau_name and "Equifax" in bureau_name):
+                            scores["Equifax"] = score_value
+                        elif bureau_symbol == "EXP" or (bureau_name and "Experian" in bureau_name):
+                            scores["Experian"] = score_value
+        except Exception as e:
+            print(f"Warning: Could not extract scores from rawReport CreditScore array: {e}")
+    return scores
+
+
+def safe_number(val):
+    try:
+        if val is None or val == "":
+            return None
+        return float(val)
+    except (TypeError, ValueError):
+        return None
+
+
+def safe_string(val):
+    if val is None:
+        return None
+    return str(val).strip() if str(val).strip() else None
+
+
+def safe_int(val):
+    number = safe_number(val)
+    return int(number) if number is not None else None
+
+
+def safe_date(val):
+    """date from "YYYY-MM-DD..." or "MM/DD/YYYY"; any other non-empty text is kept as the stripped string."""
+    text = safe_string(val)
+    if text is None:
+        return None
+    try:
+        return date.fromisoformat(text[:10])
+    except ValueError:
+        pass
+    try:
+        return datetime.strptime(text, "%m/%d/%Y").date()
+    except ValueError:
+        return text
+
+
+# Each section normalizer takes (raw, report, scores) and returns that section's value.
+def normalize_personal_info(raw: dict, report: ParsedReport, scores: dict) -> dict:
+    cr_json, borrower = report.cr_json, report.borrower
+    personal_info = {}
+
+    if isinstance(cr_json, dict):
         if borrower:
             # Extract name - may need to construct from multiple sources
             name = borrower.get("BorrowerName")
@@ -651,7 +1859,7 @@ def normalize_report(raw: dict, scores: dict):
             if birth_dates:
                 birth_date = birth_dates[0].get("date")
             
-            normalized["personal_info"] = {
+            personal_info = {
                 "name": safe_string(name),
                 "ssn": safe_string(ssn),
                 "dateOfBirth": safe_string(birth_date),
@@ -688,118 +1896,143 @@ def normalize_report(raw: dict, scores: dict):
                     street = " ".join(street_parts)
                     addr_str = f"{street}, {credit_address.get('city', '')}, {credit_address.get('stateCode', '')}, {credit_address.get('postalCode', '')}".strip(', ')
                 
-                normalized["personal_info"]["previous_addresses"].append({
+                personal_info["previous_addresses"].append({
                     "address": safe_string(addr_str) if addr_str.strip(', ') else None,
                     "date_reported": safe_string(prev_addr.get("dateReported")),
                     "bureau": safe_string(bureau_name)
                 })
+    return personal_info
+
+
+def normalize_scores(raw: dict, report: ParsedReport, scores: dict) -> dict:
+    # JSON scores (BundleComponents, then rawReport CreditScore) win over scraped HTML
+    normalized_scores = dict(scores or {})
+    if isinstance(report.cr_json, dict):
+        normalized_scores.update(scores_from_credit_report(report.cr_json, report.borrower if report.has_raw_report else None))
+    return normalized_scores
+
+
+# Per-source field extraction, shared by the v1 and v2 account normalizers so
+# both schemas read the same upstream fields. Values are raw (unconverted) and
+# keyed by Account field name.
+def _trade_fields(trade: dict) -> dict:
+    """Fields of a `trades` API entry."""
+    creditor_contact = (trade.get("memberCodeAccount") or {}).get("creditorContact") or {}
+    bureau = (creditor_contact.get("creditorContactSource")
+              or (trade.get("creditorContact") or {}).get("creditorContactSource")
+              or trade.get("bureau") or trade.get("source") or trade.get("reportingBureau"))
+    return {
+        "creditor": (trade.get("institution") or {}).get("name"),
+        "account_number": trade.get("maskedAccountNumber"),
+        "bureau": bureau,
+        "account_type": (trade.get("accountTypeDisplay") or (trade.get("accountTypeObj") or {}).get("description")
+                         or trade.get("accountType")),
+        "status": trade.get("accountStatus") or trade.get("currentAccountRatingDisplay"),
+        "balance": trade.get("currentBalanceAmount"),
+        "credit_limit": trade.get("creditLimitAmount"),
+        "high_balance": trade.get("highCreditAmount"),
+        "payment_amount": trade.get("termsMonthlyPayment") or trade.get("scheduledMonthlyPayment"),
+        "open_date": trade.get("openDateFormatted") or trade.get("openDate"),
+        "closed_date": trade.get("closedDate"),
+        "last_reported": trade.get("lastReported"),
+        "payment_history": trade.get("paymentHistory"),
+        "times_30_late": trade.get("times30Late"),
+        "times_60_late": trade.get("times60Late"),
+        "times_90_late": trade.get("times90Late"),
+        "member_code": trade.get("memberCode"),
+        "account_age": trade.get("accountAge"),
+    }
 
-    # --- Scores ---
-    # First, try to extract scores from BundleComponents (VantageScore components)
-    if isinstance(cr_json, dict):
-        comps = (cr_json.get("BundleComponents") or {}).get("BundleComponent", [])
-        if isinstance(comps, dict):
-            comps = [comps]
-        for comp in comps:
-            bureau = comp.get("Type")
-            cs = comp.get("CreditScoreType") or {}
-            score = cs.get("riskScore") or cs.get("score")
-            if score and bureau:
-                if "TUC" in bureau:
-                    normalized["scores"]["TransUnion"] = score
-                elif "EQF" in bureau:
-                    normalized["scores"]["Equifax"] = score
-                elif "EXP" in bureau:
-                    normalized["scores"]["Experian"] = score
-        
-        # Also check scores in rawReport JSON - look for CreditScore array in MergeCreditReports
-        if raw_report_str and borrower:
-            try:
-                credit_scores = borrower.get("CreditScore", [])
-                if isinstance(credit_scores, list):
-                    for credit_score in credit_scores:
-                        score_value = credit_score.get("riskScore")
-                        source = credit_score.get("Source", {})
-                        bureau_info = source.get("Bureau", {})
-                        bureau_symbol = bureau_info.get("symbol")
-                        bureau_name = bureau_info.get("description")
-                        
-                        if score_value and bureau_symbol:
-                            if bureau_symbol == "TUC" or (bureau_name and "TransUnion" in bureau_name):
-                                normalized["scores"]["TransUnion"] = score_value
-                            elif bureau_symbol == "EQF" or (bureau_name and "Equifax" in bureau_name):
-                                normalized["scores"]["Equifax"] = score_value
-                            elif bureau_symbol == "EXP" or (bureau_name and "Experian" in bureau_name):
-                                normalized["scores"]["Experian"] = score_value
-            except Exception as e:
-                print(f"Warning: Could not extract scores from rawReport CreditScore array: {e}")
 
-    # --- Accounts ---
+def _tradeline_fields(tradeline: dict, bureau, aliases: bool = True) -> dict:
+    """
+    Fields of a rawReport Tradeline. TradeLinePartition entries also carry
+    amounts and dates under alternate names (`aliases`); the individual
+    bureau reports are read by their primary names only.
+    """
+    alias = tradeline.get if aliases else (lambda name: None)
+    return {
+        "creditor": tradeline.get("creditorName"),
+        "account_number": tradeline.get("accountNumber") or tradeline.get("maskedAccountNumber"),
+        "bureau": bureau,
+        "account_type": tradeline.get("accountType") or tradeline.get("accountTypeDescription"),
+        "status": tradeline.get("accountStatus") or (tradeline.get("accountCondition") or {}).get("description"),
+        "balance": tradeline.get("currentBalance") or alias("balanceAmount"),
+        "credit_limit": tradeline.get("creditLimit") or alias("creditLimitAmount"),
+        "high_balance": tradeline.get("highBalance") or alias("highCreditAmount"),
+        "open_date": tradeline.get("dateOpened") or alias("openDate"),
+        "closed_date": tradeline.get("dateClosed") or alias("closedDate"),
+    }
+
+
+def _partition_bureau(tradeline: dict):
+    """Bureau symbol of a TradeLinePartition Tradeline."""
+    return ((tradeline.get("Source") or {}).get("Bureau") or {}).get("symbol")
+
+
+def _tradeline_account_v1(f: dict) -> dict:
+    """v1 account dict for rawReport Tradeline fields (see _tradeline_fields)."""
+    return {
+        "institution": {
+            "name": safe_string(f["creditor"])
+        },
+        "accountTypeObj": {
+            "description": safe_string(f["account_type"])
+        } if f["account_type"] else None,
+        "accountType": safe_string(f["account_type"]),
+        "accountStatus": safe_string(f["status"]),
+        "currentBalanceAmount": safe_string(f["balance"]),
+        "creditLimitAmount": safe_string(f["credit_limit"]),
+        "currentAccountRatingDisplay": safe_string(f["status"]),
+        "openDateFormatted": safe_string(f["open_date"]),
+        "maskedAccountNumber": safe_string(f["account_number"]),
+        "highCreditAmount": safe_string(f["high_balance"]),
+        "creditorContactSource": safe_string(f["bureau"]),
+        "bureau": safe_string(f["bureau"]),
+        "dateClosed": safe_string(f["closed_date"]),
+
+        # Legacy field names
+        "account_type": safe_string(f["account_type"]),
+        "status": safe_string(f["status"]),
+        "balance": safe_number(f["balance"]) if f["balance"] else None,
+        "credit_limit": safe_number(f["credit_limit"]) if f["credit_limit"] else None,
+        "high_balance": safe_number(f["high_balance"]) if f["high_balance"] else None,
+        "open_date": safe_string(f["open_date"]),
+        "closed_date": safe_string(f["closed_date"]),
+        "account_number": safe_string(f["account_number"])
+    }
+
+
+def normalize_accounts(raw: dict, report: ParsedReport, scores: dict) -> list:
+    true_link = report.true_link
+    accounts = []
+
+    # Merge index: an account seen in several sources updates one entry instead of being re-scanned or duplicated
+    account_index = {}  # (masked account number, creditor, bureau key) -> account
+    account_pairs = set()  # (masked account number, creditor) seen under any bureau
+
+    def account_key(account_number, creditor_name, bureau):
+        # Symbol and name of a bureau ("TUC", "TransUnion") index the same account
+        return (safe_string(account_number), safe_string(creditor_name), _bureau_key(bureau))
+
+    def add_account(key, acct):
+        accounts.append(acct)
+        account_index.setdefault(key, acct)
+        account_pairs.add(key[:2])
+
     trades = (raw.get("trades") or {}).get("trades", [])
     if isinstance(trades, dict):
         trades = [trades]
     for trade in trades:
-        # Extract institution info
-        inst = trade.get("institution") or {}
-        institution_name = inst.get("name")
-        
-        # Extract account type - use the actual field structure from SmartCredit
-        account_type_obj = trade.get("accountTypeObj") or {}
-        account_type_display = trade.get("accountTypeDisplay")
-        account_type_description = account_type_obj.get("description")
-        
-        # Use the most descriptive name available
-        account_type = account_type_display or account_type_description or trade.get("accountType")
-        
-        # Extract bureau info from nested memberCodeAccount structure
-        member_code_account = trade.get("memberCodeAccount") or {}
-        creditor_contact = member_code_account.get("creditorContact") or {}
-        bureau = creditor_contact.get("creditorContactSource")
-        
-        # Fallback: try direct creditorContact (in case structure varies)
-        if not bureau:
-            creditor_contact_direct = trade.get("creditorContact") or {}
-            bureau = creditor_contact_direct.get("creditorContactSource")
-        
-        # Final fallback to other possible bureau fields
-        if not bureau:
-            bureau = (trade.get("bureau") or 
-                     trade.get("source") or
-                     trade.get("reportingBureau"))
-        
-        # Extract account status
-        account_status = trade.get("accountStatus") or trade.get("currentAccountRatingDisplay")
-        
-        # Extract amounts (SmartCredit uses string amounts)
-        current_balance = trade.get("currentBalanceAmount")
-        credit_limit = trade.get("creditLimitAmount") 
-        high_credit = trade.get("highCreditAmount")
-        
-        # Extract dates
-        open_date = trade.get("openDateFormatted") or trade.get("openDate")
-        closed_date = trade.get("closedDate")
-        
-        # Extract account number
-        account_number = trade.get("maskedAccountNumber")
-        
-        # Extract other fields
-        payment_amount = trade.get("termsMonthlyPayment") or trade.get("scheduledMonthlyPayment")
-        last_reported = trade.get("lastReported")
-        member_code = trade.get("memberCode")
-        
-        # Payment history and delinquencies
-        payment_history = trade.get("paymentHistory")
-        times_30_late = trade.get("times30Late") 
-        times_60_late = trade.get("times60Late")
-        times_90_late = trade.get("times90Late")
-        
-        # Account age calculation (if not directly available)
-        account_age = trade.get("accountAge")
-        
+        f = _trade_fields(trade)
+        account_type, account_status = f["account_type"], f["status"]
+        current_balance, credit_limit, high_credit = f["balance"], f["credit_limit"], f["high_balance"]
+        payment_amount = f["payment_amount"]
+
         # Create the normalized account object matching your expected structure
         acct = {
             "institution": {
-                "name": safe_string(institution_name)
+                "name": safe_string(f["creditor"])
             },
             "accountTypeObj": {
                 "description": safe_string(account_type)
@@ -809,20 +2042,20 @@ def normalize_report(raw: dict, scores: dict):
             "currentBalanceAmount": safe_string(current_balance),
             "creditLimitAmount": safe_string(credit_limit),
             "currentAccountRatingDisplay": safe_string(account_status),
-            "openDateFormatted": safe_string(open_date),
-            "maskedAccountNumber": safe_string(account_number),
+            "openDateFormatted": safe_string(f["open_date"]),
+            "maskedAccountNumber": safe_string(f["account_number"]),
             "highCreditAmount": safe_string(high_credit),
             "termsMonthlyPayment": safe_string(payment_amount),
-            "paymentHistory": safe_string(payment_history),
-            "times30Late": safe_number(times_30_late),
-            "times60Late": safe_number(times_60_late),
-            "times90Late": safe_number(times_90_late),
-            "creditorContactSource": safe_string(bureau),  # KEY FIELD - now properly extracted!
-            "bureau": safe_string(bureau),  # Also include as 'bureau' field
-            "lastReported": safe_string(last_reported),
-            "accountAge": safe_string(account_age),
-            "dateClosed": safe_string(closed_date),
-            "memberCode": safe_string(member_code),
+            "paymentHistory": safe_string(f["payment_history"]),
+            "times30Late": safe_number(f["times_30_late"]),
+            "times60Late": safe_number(f["times_60_late"]),
+            "times90Late": safe_number(f["times_90_late"]),
+            "creditorContactSource": safe_string(f["bureau"]),  # KEY FIELD - now properly extracted!
+            "bureau": safe_string(f["bureau"]),  # Also include as 'bureau' field
+            "lastReported": safe_string(f["last_reported"]),
+            "accountAge": safe_string(f["account_age"]),
+            "dateClosed": safe_string(f["closed_date"]),
+            "memberCode": safe_string(f["member_code"]),
             
             # Legacy field names for backward compatibility
             "account_type": safe_string(account_type),
@@ -830,14 +2063,14 @@ def normalize_report(raw: dict, scores: dict):
             "balance": safe_number(current_balance) if current_balance else None,
             "credit_limit": safe_number(credit_limit) if credit_limit else None,
             "high_balance": safe_number(high_credit) if high_credit else None,
-            "open_date": safe_string(open_date),
-            "closed_date": safe_string(closed_date),
+            "open_date": safe_string(f["open_date"]),
+            "closed_date": safe_string(f["closed_date"]),
             "payment_amount": safe_number(payment_amount) if payment_amount else None,
-            "account_number": safe_string(account_number),
-            "last_reported": safe_string(last_reported),
-            "account_age": safe_string(account_age)
+            "account_number": safe_string(f["account_number"]),
+            "last_reported": safe_string(f["last_reported"]),
+            "account_age": safe_string(f["account_age"])
         }
-        normalized["accounts"].append(acct)
+        add_account(account_key(f["account_number"], f["creditor"], f["bureau"]), acct)
 
     # --- Additional Accounts from TradeLinePartition in rawReport ---
     # Extract accounts from TradeLinePartition which contains multi-bureau data
@@ -858,154 +2091,166 @@ def normalize_report(raw: dict, scores: dict):
             for tradeline in tradelines:
                 if not isinstance(tradeline, dict):
                     continue
+                f = _tradeline_fields(tradeline, _partition_bureau(tradeline))
                 
-                # Extract bureau information from Source
-                source = tradeline.get("Source", {})
-                bureau_info = source.get("Bureau", {})
-                bureau_symbol = bureau_info.get("symbol")
-                bureau_name = bureau_info.get("description")
-                
-                # Extract basic account info
-                creditor_name = tradeline.get("creditorName")
-                account_number = tradeline.get("accountNumber") or tradeline.get("maskedAccountNumber")
-                account_type = tradeline.get("accountType") or tradeline.get("accountTypeDescription")
-                account_status = tradeline.get("accountStatus") or tradeline.get("accountCondition", {}).get("description")
-                current_balance = tradeline.get("currentBalance") or tradeline.get("balanceAmount")
-                credit_limit = tradeline.get("creditLimit") or tradeline.get("creditLimitAmount")
-                high_balance = tradeline.get("highBalance") or tradeline.get("highCreditAmount")
-                open_date = tradeline.get("dateOpened") or tradeline.get("openDate")
-                close_date = tradeline.get("dateClosed") or tradeline.get("closedDate")
-                
-                # Create account entry for this bureau-specific tradeline
-                tradeline_acct = {
-                    "institution": {
-                        "name": safe_string(creditor_name)
-                    },
-                    "accountTypeObj": {
-                        "description": safe_string(account_type)
-                    } if account_type else None,
-                    "accountType": safe_string(account_type),
-                    "accountStatus": safe_string(account_status),
-                    "currentBalanceAmount": safe_string(current_balance),
-                    "creditLimitAmount": safe_string(credit_limit),
-                    "currentAccountRatingDisplay": safe_string(account_status),
-                    "openDateFormatted": safe_string(open_date),
-                    "maskedAccountNumber": safe_string(account_number),
-                    "highCreditAmount": safe_string(high_balance),
-                    "creditorContactSource": safe_string(bureau_symbol),
-                    "bureau": safe_string(bureau_symbol),
-                    "dateClosed": safe_string(close_date),
-                    
-                    # Legacy field names
-                    "account_type": safe_string(account_type),
-                    "status": safe_string(account_status),
-                    "balance": safe_number(current_balance) if current_balance else None,
-                    "credit_limit": safe_number(credit_limit) if credit_limit else None,
-                    "high_balance": safe_number(high_balance) if high_balance else None,
-                    "open_date": safe_string(open_date),
-                    "closed_date": safe_string(close_date),
-                    "account_number": safe_string(account_number)
-                }
-                
-                # Avoid duplicates by checking if we already have this account
-                is_duplicate = False
-                for existing_acct in normalized["accounts"]:
-                    if (existing_acct.get("maskedAccountNumber") == account_number and 
-                        existing_acct.get("institution", {}).get("name") == creditor_name and
-                        existing_acct.get("bureau") == bureau_symbol):
-                        is_duplicate = True
-                        break
-                
-                if not is_duplicate and creditor_name and account_number:
-                    normalized["accounts"].append(tradeline_acct)
+                # Same account from the same bureau: merge into the existing entry
+                key = account_key(f["account_number"], f["creditor"], f["bureau"])
+                existing_acct = account_index.get(key)
+                if existing_acct is not None:
+                    _merge_missing(existing_acct, _tradeline_account_v1(f))
+                elif f["creditor"] and f["account_number"]:
+                    add_account(key, _tradeline_account_v1(f))
 
     # --- Additional Accounts from Individual Bureau Reports in rawReport ---
-    if raw_report_str:
-        try:
-            raw_report_data = json.loads(raw_report_str)
-            bundle_components = raw_report_data.get("BundleComponents", {})
-            if isinstance(bundle_components, dict):
-                bundle_component_list = bundle_components.get("BundleComponent", [])
-                if isinstance(bundle_component_list, dict):
-                    bundle_component_list = [bundle_component_list]
+    try:
+        for bureau_symbol, comp in report.bureau_reports:
+            # Extract tradelines from this bureau report
+            report_data = comp.get("CreditReportType", {})
+            tradelines = report_data.get("Tradeline", []) or report_data.get("Trade", []) or report_data.get("Account", [])
+            if isinstance(tradelines, dict):
+                tradelines = [tradelines]
+            
+            for tradeline in tradelines:
+                f = _tradeline_fields(tradeline, bureau_symbol, aliases=False)
                 
-                # Look for individual bureau reports
-                for comp in bundle_component_list:
-                    comp_type = comp.get("Type")
-                    if comp_type in ["TUCReportV6", "EQFReportV6", "EXPReportV6"]:
-                        bureau_symbol = "TUC" if "TUC" in comp_type else ("EQF" if "EQF" in comp_type else "EXP")
-                        bureau_name = "TransUnion" if bureau_symbol == "TUC" else ("Equifax" if bureau_symbol == "EQF" else "Experian")
-                        
-                        # Extract tradelines from this bureau report
-                        report_data = comp.get("CreditReportType", {})
-                        tradelines = report_data.get("Tradeline", []) or report_data.get("Trade", []) or report_data.get("Account", [])
-                        if isinstance(tradelines, dict):
-                            tradelines = [tradelines]
-                        
-                        for tradeline in tradelines:
-                            # Extract basic info
-                            creditor_name = tradeline.get("creditorName")
-                            account_number = tradeline.get("accountNumber") or tradeline.get("maskedAccountNumber")
-                            account_type = tradeline.get("accountType") or tradeline.get("accountTypeDescription")
-                            account_status = tradeline.get("accountStatus") or tradeline.get("accountCondition", {}).get("description")
-                            current_balance = tradeline.get("currentBalance")
-                            credit_limit = tradeline.get("creditLimit")
-                            high_balance = tradeline.get("highBalance")
-                            open_date = tradeline.get("dateOpened")
-                            close_date = tradeline.get("dateClosed")
-                            
-                            # Create additional account entry
-                            additional_acct = {
-                                "institution": {
-                                    "name": safe_string(creditor_name)
-                                },
-                                "accountTypeObj": {
-                                    "description": safe_string(account_type)
-                                } if account_type else None,
-                                "accountType": safe_string(account_type),
-                                "accountStatus": safe_string(account_status),
-                                "currentBalanceAmount": safe_string(current_balance),
-                                "creditLimitAmount": safe_string(credit_limit),
-                                "currentAccountRatingDisplay": safe_string(account_status),
-                                "openDateFormatted": safe_string(open_date),
-                                "maskedAccountNumber": safe_string(account_number),
-                                "highCreditAmount": safe_string(high_balance),
-                                "creditorContactSource": safe_string(bureau_symbol),
-                                "bureau": safe_string(bureau_symbol),
-                                "dateClosed": safe_string(close_date),
-                                
-                                # Legacy field names
-                                "account_type": safe_string(account_type),
-                                "status": safe_string(account_status),
-                                "balance": safe_number(current_balance) if current_balance else None,
-                                "credit_limit": safe_number(credit_limit) if credit_limit else None,
-                                "high_balance": safe_number(high_balance) if high_balance else None,
-                                "open_date": safe_string(open_date),
-                                "closed_date": safe_string(close_date),
-                                "account_number": safe_string(account_number)
-                            }
-                            
-                            # Avoid duplicates by checking if we already have this account
-                            is_duplicate = False
-                            for existing_acct in normalized["accounts"]:
-                                if (existing_acct.get("maskedAccountNumber") == account_number and 
-                                    existing_acct.get("institution", {}).get("name") == creditor_name):
-                                    is_duplicate = True
-                                    break
-                            
-                            if not is_duplicate:
-                                normalized["accounts"].append(additional_acct)
-                        
-        except Exception as e:
-            print(f"Warning: Could not extract additional accounts from rawReport bureau reports: {e}")
+                # Merge into the same bureau's entry; skip if only another bureau has it
+                key = account_key(f["account_number"], f["creditor"], f["bureau"])
+                existing_acct = account_index.get(key)
+                if existing_acct is not None:
+                    _merge_missing(existing_acct, _tradeline_account_v1(f))
+                elif key[:2] not in account_pairs:
+                    add_account(key, _tradeline_account_v1(f))
+    except Exception as e:
+        print(f"Warning: Could not extract additional accounts from rawReport bureau reports: {e}")
+    return accounts
+
+
+@dataclass(slots=True)
+class Account:
+    """
+    One account in the v2 schema: every field once, amounts as numbers and
+    dates as dates (ISO 8601 in JSON). A slotted record is about half the
+    size of the v1 dict, which repeats most fields under legacy names.
+    """
+    creditor: str = None
+    account_number: str = None
+    bureau: str = None
+    account_type: str = None
+    status: str = None
+    balance: float = None
+    credit_limit: float = None
+    high_balance: float = None
+    payment_amount: float = None
+    open_date: date = None
+    closed_date: date = None
+    last_reported: date = None
+    payment_history: str = None
+    times_30_late: int = None
+    times_60_late: int = None
+    times_90_late: int = None
+    member_code: str = None
+    account_age: str = None
+
+    def merge_missing(self, other):
+        """Fill fields that are empty here from `other`."""
+        for name in ACCOUNT_FIELDS:
+            if getattr(self, name) is None:
+                setattr(self, name, getattr(other, name))
+
+
+ACCOUNT_FIELDS = tuple(f.name for f in fields(Account))
+ACCOUNT_TYPES = {f.name: f.type for f in fields(Account)}
+
+_ACCOUNT_CONVERTERS = {float: safe_number, int: safe_int, date: safe_date}
+
+
+def _account(f: dict) -> Account:
+    """Account from extracted source fields (see _trade_fields / _tradeline_fields)."""
+    return Account(**{name: _ACCOUNT_CONVERTERS.get(ACCOUNT_TYPES[name], safe_string)(value) for name, value in f.items()})
+
+
+def normalize_accounts_v2(raw: dict, report: ParsedReport, scores: dict) -> list:
+    """normalize_accounts for schema v2: the same sources, fields and merge rules, built as Account records."""
+    true_link = report.true_link
+    accounts = []
+    account_index = {}  # _account_identity -> Account
+    account_pairs = set()  # (masked account number, creditor) seen under any bureau
+
+    def add_account(acct):
+        key = _account_identity(acct)
+        accounts.append(acct)
+        account_index.setdefault(key, acct)
+        account_pairs.add(key[:2])
+
+    trades = (raw.get("trades") or {}).get("trades", [])
+    if isinstance(trades, dict):
+        trades = [trades]
+    for trade in trades:
+        add_account(_account(_trade_fields(trade)))
+
+    # --- TradeLinePartition: merge into the same bureau's account, else add ---
+    if true_link:
+        partition = true_link.get("TradeLinePartition", [])
+        if isinstance(partition, dict):
+            partition = [partition]
+        for partition_item in partition:
+            tradelines = partition_item.get("Tradeline", {})
+            if not isinstance(tradelines, list):
+                tradelines = [tradelines] if tradelines else []
+            for tradeline in tradelines:
+                if not isinstance(tradeline, dict):
+                    continue
+                acct = _account(_tradeline_fields(tradeline, _partition_bureau(tradeline)))
+                existing = account_index.get(_account_identity(acct))
+                if existing is not None:
+                    existing.merge_missing(acct)
+                elif acct.creditor and acct.account_number:
+                    add_account(acct)
+
+    # --- Individual bureau reports: merge, or add only if no bureau has the account yet ---
+    try:
+        for bureau_symbol, comp in report.bureau_reports:
+            report_data = comp.get("CreditReportType", {})
+            tradelines = report_data.get("Tradeline", []) or report_data.get("Trade", []) or report_data.get("Account", [])
+            if isinstance(tradelines, dict):
+                tradelines = [tradelines]
+            for tradeline in tradelines:
+                acct = _account(_tradeline_fields(tradeline, bureau_symbol, aliases=False))
+                key = _account_identity(acct)
+                existing = account_index.get(key)
+                if existing is not None:
+                    existing.merge_missing(acct)
+                elif key[:2] not in account_pairs:
+                    add_account(acct)
+    except Exception as e:
+        print(f"Warning: Could not extract additional accounts from rawReport bureau reports: {e}")
+    return accounts
+
+
+def normalize_inquiries(raw: dict, report: ParsedReport, scores: dict) -> list:
+    true_link, borrower = report.true_link, report.borrower
+    inquiries = []
+    inquiry_index = {}  # (subscriber, date, bureau) -> inquiry, so repeats across sources merge
+
+    def add_inquiry(inquiry):
+        key = (
+            str(inquiry.get("business_name") or "").strip().lower(),
+            str(inquiry.get("inquiry_date") or "").strip(),
+            _bureau_key(inquiry.get("bureau")),
+        )
+        existing = inquiry_index.get(key)
+        if existing is not None:
+            _merge_missing(existing, inquiry)
+        else:
+            inquiry_index[key] = inquiry
+            inquiries.append(inquiry)
 
-    # --- Inquiries ---
     # Check for inquiries in search_results first
     inqs = (raw.get("search_results") or {}).get("inquiries", [])
     if isinstance(inqs, dict):
         inqs = [inqs]
     for iq in inqs:
-        normalized["inquiries"].append({
+        add_inquiry({
             "bureau": iq.get("bureau"),
             "business_name": iq.get("subscriberName"),
             "inquiry_date": iq.get("inquiryDate"),
@@ -1028,7 +2273,7 @@ def normalize_report(raw: dict, scores: dict):
                     bureau_info = source.get("Bureau", {})
                     bureau_name = bureau_info.get("description") or bureau_info.get("abbreviation")
                 
-                normalized["inquiries"].append({
+                add_inquiry({
                     "bureau": bureau_name,
                     "business_name": inquiry_data.get("subscriberName"),
                     "inquiry_date": inquiry_data.get("inquiryDate"),
@@ -1045,26 +2290,34 @@ def normalize_report(raw: dict, scores: dict):
             bureau_info = source.get("Bureau", {})
             bureau_name = bureau_info.get("description") or bureau_info.get("symbol")
             
-            normalized["inquiries"].append({
+            add_inquiry({
                 "bureau": bureau_name,
                 "business_name": iq.get("subscriberName") or iq.get("businessName"),
                 "inquiry_date": iq.get("inquiryDate") or iq.get("dateReported"),
                 "type": iq.get("inquiryType") or iq.get("type"),
             })
+    return inquiries
 
-    # --- Public Records ---
+
+def normalize_public_records(raw: dict, report: ParsedReport, scores: dict) -> list:
+    public_records = []
     prs = (raw.get("search_results") or {}).get("publicRecords", [])
     if isinstance(prs, dict):
         prs = [prs]
     for pr in prs:
-        normalized["public_records"].append({
+        public_records.append({
             "type": pr.get("type"),
             "date_filed": pr.get("dateFiled"),
             "status": pr.get("status"),
             "amount": safe_number(pr.get("amount")),
         })
+    return public_records
+
+
+def normalize_employers(raw: dict, report: ParsedReport, scores: dict) -> list:
+    cr_json, borrower = report.cr_json, report.borrower
+    normalized_employers = []
 
-    # --- Employers ---
     # Extract from rawReport borrower data
     if borrower:
         employers = borrower.get("Employer", [])
@@ -1075,7 +2328,7 @@ def normalize_report(raw: dict, scores: dict):
             bureau_info = source.get("Bureau", {})
             bureau_name = bureau_info.get("description") or bureau_info.get("symbol")
             
-            normalized["employers"].append({
+            normalized_employers.append({
                 "name": emp.get("name"),
                 "date_reported": emp.get("dateReported") or emp.get("dateUpdated"),
                 "bureau": bureau_name,
@@ -1086,48 +2339,1107 @@ def normalize_report(raw: dict, scores: dict):
     if isinstance(fallback_employers, dict):
         fallback_employers = [fallback_employers]
     for emp in fallback_employers:
-        normalized["employers"].append({
+        normalized_employers.append({
             "name": emp.get("name") or emp.get("employerName"),
             "date_reported": emp.get("dateReported") or emp.get("dateUpdated"),
             "bureau": emp.get("bureau"),
         })
+    return normalized_employers
+
+
+# Section -> normalizer, in the order sections are produced (and streamed)
+NORMALIZERS = {
+    "scores": normalize_scores,
+    "personal_info": normalize_personal_info,
+    "accounts": normalize_accounts,
+    "inquiries": normalize_inquiries,
+    "public_records": normalize_public_records,
+    "employers": normalize_employers,
+}
+
+# Output schema -> section normalizers. v1 accounts carry every field twice (modern
+# and legacy names) as strings; v2 accounts are Account records.
+SCHEMAS = {
+    "v1": NORMALIZERS,
+    "v2": dict(NORMALIZERS, accounts=normalize_accounts_v2),
+}
+
+
+def iter_normalized_sections(raw: dict, scores: dict, report: ParsedReport = None, sections=None, schema: str = "v1"):
+    """Yield (section, value) pairs as each section is normalized; `sections` limits which run."""
+    report = report or ParsedReport.from_raw(raw)
+    for section, normalizer in SCHEMAS[schema].items():
+        if sections is None or section in sections:
+            yield section, normalizer(raw, report, scores)
+
 
+def normalize_report(raw: dict, scores: dict, report: ParsedReport = None, sections=None, schema: str = "v1"):
+    """Normalize raw SmartCredit JSON into client’s expected structure.
+
+    `report` is the ParsedReport of raw["credit_report_json"] when the caller
+    already built one; otherwise it is parsed here. With `sections`, only
+    those keys are built and returned; `schema` picks the SCHEMAS layout.
+    """
+    normalized = {
+        "personal_info": {},
+        "scores": {},
+        "accounts": [],
+        "inquiries": [],
+        "public_records": [],
+        "employers": []
+    }
+    if sections is not None:
+        normalized = {key: value for key, value in normalized.items() if key in sections}
+    normalized.update(iter_normalized_sections(raw, scores, report, sections, schema))
     return normalized
 
 
 # -----------------------------
-# Routes
+# Result Cache
 # -----------------------------
-@app.route("/fetch_report", methods=["POST"])
-@require_api_key
-def fetch_report():
-    """Return both RAW and Normalized SmartCredit data."""
-    data = request.get_json(silent=True)
-    if not data:
-        return jsonify({"ok": False, "error": "Invalid JSON body"}), 400
+def section_hashes(report: dict, known: dict = None) -> dict:
+    """Content hash per section; `known` supplies hashes already computed for unchanged sections."""
+    known = known or {}
+    return {section: known.get(section) or hashlib.sha256(dumps_canonical(value)).hexdigest()
+            for section, value in report.items()}
+
+
+def report_etag(report: dict, hashes: dict = None) -> str:
+    """Content hash of a normalized report (over its section hashes), used as its ETag."""
+    return hashlib.sha256(dumps_canonical(hashes or section_hashes(report))).hexdigest()
+
+
+def report_cache_key(email: str, password: str, **options) -> str:
+    """Result-cache key: credential hash plus every option that changes the output."""
+    return _cache_key_for(credential_key(email, password), **options)
+
+
+def _cache_key_for(cred_key: str, **options) -> str:
+    return cred_key + ":" + json.dumps(options, sort_keys=True)
+
+
+def history_key(cred_key: str, schema: str = "v1") -> str:
+    """ReportHistory key; each schema keeps its own versions (and ETags)."""
+    return cred_key if schema == "v1" else f"{cred_key}:{schema}"
+
+
+class ResultCache:
+    """TTL + LRU cache of normalized reports. Entries are {"report", "etag", "section_hashes", "stored_at"}."""
+
+    def __init__(self, ttl: int = RESULT_CACHE_TTL, max_entries: int = RESULT_CACHE_MAX_ENTRIES):
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, cache_key: str, max_age: float = None):
+        """Entry for `cache_key` if it is younger than both the TTL and `max_age`."""
+        limit = self.ttl if max_age is None else min(self.ttl, max_age)
+        with self._lock:
+            entry = self._entries.get(cache_key)
+            if entry is None:
+                return None
+            age = time.time() - entry["stored_at"]
+            if age >= self.ttl:
+                del self._entries[cache_key]
+                return None
+            if age >= limit:
+                return None
+            self._entries.move_to_end(cache_key)
+            return entry
+
+    def put(self, cache_key: str, report: dict, known_hashes: dict = None, stored_at: float = None) -> dict:
+        hashes = section_hashes(report, known_hashes)
+        entry = {"report": report, "etag": report_etag(report, hashes), "section_hashes": hashes,
+                 "stored_at": stored_at or time.time()}
+        if self.ttl <= 0:
+            return entry
+        with self._lock:
+            self._entries[cache_key] = entry
+            self._entries.move_to_end(cache_key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+        return entry
+
+
+result_cache = ResultCache()
+
+
+# -----------------------------
+# Report History
+# -----------------------------
+class ReportHistory:
+    """
+    The last few full reports per credential hash, with their section hashes
+    and source-payload hashes. Serves `since=<etag>` deltas and lets a refetch
+    reuse sections whose upstream payloads have not changed. LRU-bounded with
+    no TTL, so daily pollers still find yesterday's report.
+    """
+
+    def __init__(self, max_entries: int = DELTA_HISTORY_MAX_ENTRIES, depth: int = DELTA_HISTORY_DEPTH):
+        self.max_entries = max_entries
+        self.depth = max(1, depth)
+        self._entries = OrderedDict()  # credential key -> [version, ...], newest last
+        self._lock = threading.Lock()
+
+    def record(self, cred_key: str, entry: dict, source_hashes: dict):
+        if self.max_entries <= 0:
+            return
+        version = {
+            "report": entry["report"],
+            "etag": entry["etag"],
+            "section_hashes": entry["section_hashes"],
+            "source_hashes": source_hashes,
+            "stored_at": entry["stored_at"],
+        }
+        with self._lock:
+            versions = [v for v in self._entries.get(cred_key, []) if v["etag"] != version["etag"]]
+            versions.append(version)
+            self._entries[cred_key] = versions[-self.depth:]
+            self._entries.move_to_end(cred_key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def latest(self, cred_key: str):
+        with self._lock:
+            versions = self._entries.get(cred_key)
+            return versions[-1] if versions else None
+
+    def find(self, cred_key: str, etag: str):
+        with self._lock:
+            for version in self._entries.get(cred_key, []):
+                if version["etag"] == etag:
+                    return version
+        return None
+
+
+report_history = ReportHistory()
+
+
+def section_source_hashes(raw: dict, scores: dict) -> dict:
+    """Hash of each section's inputs: its SECTION_ENDPOINTS payloads, plus the HTML scores for "scores"."""
+    payload_hashes = {}
+    hashes = {}
+    for section, keys in SECTION_ENDPOINTS.items():
+        digest = hashlib.sha256()
+        for key in keys:
+            if key not in payload_hashes:
+                payload_hashes[key] = hashlib.sha256(dumps_canonical(raw.get(key))).hexdigest()
+            digest.update(payload_hashes[key].encode())
+        if section == "scores":
+            digest.update(dumps_canonical(scores or {}))
+        hashes[section] = digest.hexdigest()
+    return hashes
+
+
+def normalize_report_incremental(raw: dict, scores: dict, report: ParsedReport = None, previous: dict = None,
+                                 schema: str = "v1"):
+    """
+    normalize_report, copying each section from `previous` (a ReportHistory
+    version) when its source hash is unchanged. Returns (normalized,
+    source_hashes, reused section names).
+    """
+    source_hashes = section_source_hashes(raw, scores)
+    reused = [s for s in NORMALIZERS if previous and previous["source_hashes"].get(s) == source_hashes[s]]
+    fresh = normalize_report(raw, scores, report, [s for s in NORMALIZERS if s not in reused], schema)
+    for section in reused:
+        metrics.inc("smartcredit_sections_reused_total", section=section)
+    fresh.update((section, previous["report"][section]) for section in reused)
+    return fresh, source_hashes, reused
+
+
+def store_report(email: str, password: str, report: dict, sections=None, source_hashes: dict = None,
+                 known_hashes: dict = None, schema: str = "v1") -> dict:
+    """Cache a freshly normalized report; full reports also become the credential's delta base."""
+    entry = result_cache.put(report_cache_key(email, password, sections=sections, schema=schema), report, known_hashes)
+    if sections is None and source_hashes is not None:
+        report_history.record(history_key(credential_key(email, password), schema), entry, source_hashes)
+    return entry
+
+
+def _keyed_items(items: list, key_fn) -> dict:
+    """Items by identity key; repeats of a key get an occurrence number so none are lost."""
+    keyed = {}
+    seen = {}
+    for item in items:
+        key = key_fn(item)
+        n = seen.get(key, 0)
+        seen[key] = n + 1
+        keyed[key + (n,)] = item
+    return keyed
+
+
+def _account_identity(acct) -> tuple:
+    if isinstance(acct, Account):
+        return (acct.account_number, acct.creditor, _bureau_key(acct.bureau))
+    return (acct.get("maskedAccountNumber"), (acct.get("institution") or {}).get("name"), _bureau_key(acct.get("bureau")))
+
+
+def _inquiry_identity(inquiry: dict) -> tuple:
+    return (str(inquiry.get("business_name") or "").strip().lower(), str(inquiry.get("inquiry_date") or "").strip(),
+            _bureau_key(inquiry.get("bureau")))
+
+
+# List sections diffed item by item; every other changed section is sent whole
+DELTA_ITEM_KEYS = {"accounts": _account_identity, "inquiries": _inquiry_identity}
+
+
+def report_delta(base: dict, entry: dict) -> dict:
+    """What changed in `entry` since the `base` version: whole sections, or added/removed/changed items."""
+    changed = {}
+    unchanged = []
+    for section, value in entry["report"].items():
+        if base["section_hashes"].get(section) == entry["section_hashes"].get(section):
+            unchanged.append(section)
+            continue
+        key_fn = DELTA_ITEM_KEYS.get(section)
+        if key_fn is None or section not in base["report"]:
+            changed[section] = value
+            continue
+        old = _keyed_items(base["report"][section], key_fn)
+        new = _keyed_items(value, key_fn)
+        changed[section] = {
+            "added": [item for key, item in new.items() if key not in old],
+            "removed": [item for key, item in old.items() if key not in new],
+            "changed": [item for key, item in new.items() if key in old and old[key] != item],
+        }
+    return {"delta": True, "since": base["etag"], "etag": entry["etag"], "unchanged": unchanged, "sections": changed}
+
+
+# -----------------------------
+# Raw Store
+# -----------------------------
+_SHA256_HEX = re.compile(r"[0-9a-f]{64}")
+
+
+def is_sha256_hex(value) -> bool:
+    """True for a credential key or blob hash: exactly 64 lowercase hex characters."""
+    return isinstance(value, str) and _SHA256_HEX.fullmatch(value) is not None
+
+
+def open_private(path: str, mode: str = "wb"):
+    """open() for writing ("w" or "a" modes) a file that holds credit data: created 0600 whatever the umask."""
+    flags = {"w": os.O_TRUNC, "a": os.O_APPEND}[mode[0]] | os.O_WRONLY | os.O_CREAT
+    return os.fdopen(os.open(path, flags, 0o600), mode)
+
+
+class RawStore:
+    """
+    Content-addressed, gzip-compressed store of raw fetches on disk, so
+    normalization changes can be backfilled without logging anyone in again.
+
+        objects/ab/<sha256>   one blob per endpoint payload, and one manifest per fetch
+        refs/<credential key>  one JSON line per fetch: {"manifest", "fetched_at"}
+
+    Blobs are named by the sha256 of their canonical JSON, so a payload that
+    has not changed since the last fetch (often the multi-megabyte rawReport)
+    is written once. Payloads are whole credit files, so blobs are always
+    Fernet-encrypted after compression, and the tree is private to the
+    process user (directories 0700, files 0600).
+    """
+
+    def __init__(self, root: str, key: str, level: int = RAW_STORE_LEVEL):
+        self.root = root
+        self.key = key
+        self.level = level
+        self._fernet = Fernet(key)
+        self._lock = threading.Lock()
+        for path in (root, os.path.join(root, "objects"), os.path.join(root, "refs")):
+            os.makedirs(path, mode=0o700, exist_ok=True)
+
+    # Names come from requests and refs files; only bare hashes may become paths under root
+    def _object_path(self, sha: str) -> str:
+        if not is_sha256_hex(sha):
+            raise ValueError(f"invalid blob hash: {sha!r}")
+        return os.path.join(self.root, "objects", sha[:2], sha)
+
+    def _ref_path(self, cred_key: str) -> str:
+        if not is_sha256_hex(cred_key):
+            raise ValueError(f"invalid credential key: {cred_key!r}")
+        return os.path.join(self.root, "refs", cred_key)
+
+    def put_blob(self, data: bytes) -> str:
+        sha = hashlib.sha256(data).hexdigest()
+        path = self._object_path(sha)
+        if os.path.exists(path):
+            return sha
+        blob = self._fernet.encrypt(gzip.compress(data, compresslevel=self.level, mtime=0))
+        os.makedirs(os.path.dirname(path), mode=0o700, exist_ok=True)
+        tmp_path = f"{path}.{uuid.uuid4().hex}.tmp"
+        with open_private(tmp_path, "wb") as f:
+            f.write(blob)
+        os.replace(tmp_path, path)  # atomic, so readers never see a partial blob
+        return sha
+
+    def get_blob(self, sha: str) -> bytes:
+        with open(self._object_path(sha), "rb") as f:
+            blob = f.read()
+        return gzip.decompress(self._fernet.decrypt(blob))
+
+    def save(self, cred_key: str, aggregated: dict, scores: dict) -> str:
+        """Store one full fetch; returns its manifest hash."""
+        manifest = {
+            "payloads": {key: self.put_blob(dumps_canonical(payload)) for key, payload in aggregated.items()},
+            "scores": scores,
+            "fetched_at": time.time(),
+        }
+        manifest_sha = self.put_blob(dumps_canonical(manifest))
+        line = json.dumps({"manifest": manifest_sha, "fetched_at": manifest["fetched_at"]}) + "\n"
+        with self._lock:
+            with open_private(self._ref_path(cred_key), "a") as f:
+                f.write(line)
+        return manifest_sha
+
+    def load(self, manifest_sha: str):
+        """(aggregated, scores, fetched_at) of a stored fetch."""
+        manifest = json.loads(self.get_blob(manifest_sha))
+        aggregated = {key: json.loads(self.get_blob(sha)) for key, sha in manifest["payloads"].items()}
+        return aggregated, manifest["scores"], manifest["fetched_at"]
+
+    def refs(self, credentials=None, all_versions: bool = False, errors: dict = None) -> list:
+        """
+        [(credential key, manifest hash, fetched_at)]: the latest fetch per
+        credential, or every fetch. Unreadable refs lines are skipped and, when
+        `errors` is given, recorded there as "<credential key>:<line>" -> reason.
+        """
+        refs_dir = os.path.join(self.root, "refs")
+        if credentials is None:
+            credentials = sorted(name for name in os.listdir(refs_dir) if is_sha256_hex(name)) if os.path.isdir(refs_dir) else []
+        found = []
+        for cred_key in credentials:
+            try:
+                with open(self._ref_path(cred_key)) as f:
+                    lines = [(number, line) for number, line in enumerate(f, 1) if line.strip()]
+            except FileNotFoundError:
+                continue
+            versions = []
+            for number, line in lines:
+                try:
+                    ref = json.loads(line)
+                    if not is_sha256_hex(ref["manifest"]):
+                        raise ValueError(f"invalid manifest hash: {ref['manifest']!r}")
+                    versions.append((cred_key, ref["manifest"], float(ref["fetched_at"])))
+                except (ValueError, KeyError, TypeError) as e:
+                    if errors is not None:
+                        errors[f"{cred_key}:{number}"] = f"bad refs line: {e}"
+            found.extend(versions if all_versions else versions[-1:])
+        return found
+
+
+if RAW_STORE_DIR and not RAW_STORE_KEY:
+    raise RuntimeError("RAW_STORE_DIR is set without RAW_STORE_KEY; raw fetches are full credit files and are only stored encrypted")
+raw_store = RawStore(RAW_STORE_DIR, RAW_STORE_KEY) if RAW_STORE_DIR else None
+# One writer thread: compressing a multi-megabyte payload stays off the request path
+_raw_store_executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="raw-store")
+atexit.register(_raw_store_executor.shutdown, wait=True)
+
+
+def _save_raw(cred_key: str, aggregated: dict, scores: dict):
+    try:
+        raw_store.save(cred_key, aggregated, scores)
+    except Exception as e:
+        print(f"Warning: Could not store raw fetch: {e}")
+
+
+def store_raw_fetch(cred_key: str, aggregated: dict, scores: dict):
+    """Queue a full fetch for the raw store (no-op when RAW_STORE_DIR is unset)."""
+    if raw_store is not None:
+        _raw_store_executor.submit(_save_raw, cred_key, aggregated, scores)
+
+
+def _renormalize_manifest(root: str, key: str, manifest_sha: str, schema: str = "v1"):
+    """Worker-process body: (report, source hashes) for one stored fetch."""
+    aggregated, scores, _ = RawStore(root, key).load(manifest_sha)
+    return normalize_report(aggregated, scores, schema=schema), section_source_hashes(aggregated, scores)
+
+
+def renormalize(credentials=None, all_versions: bool = False, workers: int = RENORMALIZE_WORKERS, out_dir: str = None,
+                schema: str = DEFAULT_SCHEMA) -> dict:
+    """
+    Re-run normalize_report over stored raw fetches in parallel worker
+    processes. The latest fetch per credential also refreshes the result
+    cache (aged by its fetch time) and the delta history; with `out_dir`
+    every report is written to <out_dir>/<credential key>/<manifest>.json.gz.
+    """
+    if raw_store is None:
+        raise RuntimeError("raw store is disabled; set RAW_STORE_DIR")
+    summary = {"processed": 0, "failed": 0, "etags": {}, "errors": {}}
+    refs = raw_store.refs(credentials, all_versions, summary["errors"])
+    summary["failed"] = len(summary["errors"])
+    latest = {cred_key: manifest_sha for cred_key, manifest_sha, _ in refs}
+
+    def finish(cred_key, manifest_sha, fetched_at, report, source_hashes):
+        if out_dir:
+            path = os.path.join(out_dir, cred_key, f"{manifest_sha}.json.gz")
+            os.makedirs(os.path.dirname(path), mode=0o700, exist_ok=True)
+            with open_private(path, "wb") as f:
+                f.write(gzip.compress(dumps_canonical(report)))
+        if latest[cred_key] == manifest_sha:
+            entry = result_cache.put(_cache_key_for(cred_key, sections=None, schema=schema), report, stored_at=fetched_at)
+            report_history.record(history_key(cred_key, schema), entry, source_hashes)
+            summary["etags"][cred_key] = entry["etag"]
+        summary["processed"] += 1
+
+    if workers <= 1 or len(refs) <= 1:
+        results = ((ref, lambda ref=ref: _renormalize_manifest(raw_store.root, raw_store.key, ref[1], schema)) for ref in refs)
+    else:
+        # spawn, not fork: this process has browser and pool threads that must not be copied
+        pool = ProcessPoolExecutor(max_workers=workers, mp_context=multiprocessing.get_context("spawn"))
+        futures = {pool.submit(_renormalize_manifest, raw_store.root, raw_store.key, ref[1], schema): ref for ref in refs}
+        results = ((futures[f], f.result) for f in as_completed(futures))
+    try:
+        for (cred_key, manifest_sha, fetched_at), get_result in results:
+            try:
+                report, source_hashes = get_result()
+            except Exception as e:
+                summary["failed"] += 1
+                summary["errors"][manifest_sha] = str(e)
+                continue
+            finish(cred_key, manifest_sha, fetched_at, report, source_hashes)
+    finally:
+        if workers > 1 and len(refs) > 1:
+            pool.shutdown()
+    return summary
+
+
+# -----------------------------
+# Report Jobs
+# -----------------------------
+def build_report(email: str, password: str, headless: bool = PLAYWRIGHT_HEADLESS, timer: StageTimer = None, sections=None,
+                 schema: str = "v1"):
+    """
+    Fetch, normalize and cache one user's report (only `sections`, when
+    given); returns the cache entry. Full reports reuse unchanged sections of
+    the credential's previous report instead of normalizing them again.
+    """
+    timer = timer or StageTimer()
+    result = fetch_report_shared(email, password, headless=headless, timer=timer, sections=sections)
+    if sections is not None:
+        with timer.stage("normalize"):
+            report = normalize_report(result["aggregated"], result["scores"], result.get("report"), sections, schema)
+        with timer.stage("hash"):
+            return store_report(email, password, report, sections, schema=schema)
+
+    previous = report_history.latest(history_key(credential_key(email, password), schema))
+    with timer.stage("normalize"):
+        report, source_hashes, reused = normalize_report_incremental(
+            result["aggregated"], result["scores"], result.get("report"), previous, schema)
+    with timer.stage("hash"):
+        known = {section: previous["section_hashes"][section] for section in reused}
+        return store_report(email, password, report, None, source_hashes, known, schema)
+
+
+def cached_report(email: str, password: str, max_age: float = None, force_refresh: bool = False, sections=None,
+                  schema: str = "v1"):
+    """
+    Cached entry for this request, or None when it has to be fetched.
+    A section subset is also served by slicing a cached full report.
+    """
+    if force_refresh:
+        return None
+    entry = result_cache.get(report_cache_key(email, password, sections=sections, schema=schema), max_age)
+    if entry is None and sections is not None:
+        full = result_cache.get(report_cache_key(email, password, sections=None, schema=schema), max_age)
+        if full is not None:
+            report = {section: full["report"][section] for section in sections}
+            hashes = {section: full["section_hashes"][section] for section in sections}
+            entry = {"report": report, "etag": report_etag(report, hashes), "section_hashes": hashes, "stored_at": full["stored_at"]}
+    metrics.inc("smartcredit_result_cache_total", result="miss" if entry is None else "hit")
+    return entry
+
+
+def get_report(email: str, password: str, headless: bool = PLAYWRIGHT_HEADLESS, max_age: float = None, force_refresh: bool = False,
+               sections=None, schema: str = "v1"):
+    """
+    Normalized report entry, from the result cache when fresh enough, else
+    fetched and cached. A fetched entry comes back as a copy carrying the
+    fetch's per-stage "timings".
+    """
+    entry = cached_report(email, password, max_age, force_refresh, sections, schema)
+    if entry is None:
+        timer = StageTimer()
+        entry = dict(build_report(email, password, headless, timer, sections, schema), timings=timer.stages)
+    return entry
+
+
+class JobManager:
+    """
+    In-process worker pool for report fetches.
+    Request threads only enqueue and poll; the browser sessions run on the
+    pool's threads (each keeps its own pooled browser).
+    Jobs submitted with the same `flight_key` while one is still queued or
+    running attach to that job (single-flight) instead of starting another.
+    Jobs submitted with record=False are not kept for polling: their result
+    is freed as soon as the callers holding the job let go of it.
+    """
+
+    def __init__(self, workers: int = JOB_WORKERS, result_ttl: int = JOB_RESULT_TTL):
+        self.result_ttl = result_ttl
+        self._executor = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="report-job")
+        self._jobs = {}
+        self._inflight = {}
+        self._lock = threading.Lock()
+
+    def submit(self, fn, *args, flight_key: str = None, record: bool = True, **kwargs) -> dict:
+        self._prune()
+        with self._lock:
+            job = self._inflight.get(flight_key) if flight_key else None
+            if job is not None:
+                return job
+            job = self._new_job(flight_key, record)
+            if flight_key:
+                self._inflight[flight_key] = job
+            job["future"] = self._executor.submit(self._run, job, fn, args, kwargs)
+        return job
+
+    def _new_job(self, flight_key: str = None, record: bool = True) -> dict:
+        job = {
+            "id": uuid.uuid4().hex,
+            "status": "queued",
+            "created_at": time.time(),
+            "finished_at": None,
+            "result": None,
+            "error": None,
+            "error_status": None,
+            "flight_key": flight_key,
+            "future": None,
+        }
+        if record:
+            self._jobs[job["id"]] = job
+        return job
+
+    def _run(self, job, fn, args, kwargs):
+        job["status"] = "running"
+        try:
+            job["result"] = fn(*args, **kwargs)
+            job["status"] = "succeeded"
+            metrics.inc("smartcredit_report_outcomes_total", outcome="ok")
+        except ValueError as e:
+            job["error"], job["error_status"] = str(e), 401
+            job["status"] = "failed"
+            metrics.inc("smartcredit_report_outcomes_total", outcome="login_failed")
+        except Exception as e:
+            job["error"], job["error_status"] = f"internal error: {e}", 500
+            job["status"] = "failed"
+            metrics.inc("smartcredit_report_outcomes_total", outcome="error")
+        finally:
+            job["finished_at"] = time.time()
+            with self._lock:
+                if self._inflight.get(job["flight_key"]) is job:
+                    del self._inflight[job["flight_key"]]
+
+    def get(self, job_id: str):
+        with self._lock:
+            return self._jobs.get(job_id)
+
+    def wait(self, job: dict, timeout: float = None) -> bool:
+        """Block until the job finishes; False if it is still running after `timeout`."""
+        try:
+            job["future"].result(timeout=timeout)
+        except FutureTimeout:
+            return False
+        return True
+
+    def _prune(self):
+        cutoff = time.time() - self.result_ttl
+        with self._lock:
+            for job_id in [j for j, job in self._jobs.items() if job["finished_at"] and job["finished_at"] < cutoff]:
+                del self._jobs[job_id]
+
+    def shutdown(self):
+        self._executor.shutdown(wait=False, cancel_futures=True)
+
+
+job_manager = JobManager()
+atexit.register(job_manager.shutdown)
+# Backfills (renormalize) run on their own thread, so they never hold a report-fetch slot
+backfill_jobs = JobManager(workers=1)
+atexit.register(backfill_jobs.shutdown)
+
+
+def job_view(job: dict) -> dict:
+    """Public JSON view of a job."""
+    view = {"ok": job["status"] != "failed", "job_id": job["id"], "status": job["status"]}
+    if job["status"] == "succeeded":
+        result = job["result"]
+        view["result"] = result["report"] if "report" in result else result
+        if "etag" in result:
+            view["etag"] = result["etag"]
+    elif job["status"] == "failed":
+        view["error"] = job["error"]
+        view["error_status"] = job["error_status"]
+    return view
+
 
+# -----------------------------
+# Batch Reports
+# -----------------------------
+class RateLimiter:
+    """Token bucket allowing `rate` acquisitions per second (bursting to `burst`)."""
+
+    def __init__(self, rate: float = BATCH_RATE_PER_SEC, burst: int = 1):
+        self.rate = rate
+        self.burst = burst
+        self._tokens = float(burst)
+        self._last = time.monotonic()
+        self._lock = threading.Lock()
+
+    def acquire(self):
+        if self.rate <= 0:
+            return
+        with self._lock:
+            now = time.monotonic()
+            self._tokens = min(self.burst, self._tokens + (now - self._last) * self.rate)
+            self._last = now
+            # Reserve a token even if it is not there yet; the deficit is slept off below
+            self._tokens -= 1
+            wait = -self._tokens / self.rate if self._tokens < 0 else 0
+        if wait:
+            time.sleep(wait)
+
+
+class BatchManager:
+    """
+    Runs a list of report requests through the job pool.
+    At most `concurrency` items of one batch are in flight, logins are paced
+    by a shared RateLimiter, and every item gets its own result/error so one
+    bad credential set never fails the batch. A batch owns its reports, kept
+    as compressed JSON once per ETag (see batch_item), until it is pruned.
+    """
+
+    def __init__(self, jobs: JobManager, concurrency: int = BATCH_CONCURRENCY, rate: float = BATCH_RATE_PER_SEC,
+                 result_ttl: int = JOB_RESULT_TTL):
+        self.jobs = jobs
+        self.concurrency = concurrency
+        self.limiter = RateLimiter(rate)
+        self.result_ttl = result_ttl
+        self._batches = {}
+        self._lock = threading.Lock()
+
+    def submit(self, items: list) -> dict:
+        self._prune()
+        batch = {
+            "id": uuid.uuid4().hex,
+            "created_at": time.time(),
+            "finished_at": None,
+            "total": len(items),
+            "completed": 0,
+            "results": [None] * len(items),
+            "reports": {},  # ETag -> zlib-compressed JSON report, shared by items with the same report
+            "events": queue.Queue(),  # indexes of items as they finish, for streaming
+        }
+        with self._lock:
+            self._batches[batch["id"]] = batch
+        threading.Thread(target=self._dispatch, args=(batch, items), name=f"batch-{batch['id'][:8]}", daemon=True).start()
+        return batch
+
+    def _dispatch(self, batch, items):
+        slots = threading.Semaphore(max(1, self.concurrency))
+        for index, item in enumerate(items):
+            if "error" in item:
+                self._record(batch, index, {"ok": False, "status": item["error_status"], "error": item["error"]})
+                continue
+
+            params = item["params"]
+            entry = cached_report(params["email"], params["password"], params["max_age"], params["force_refresh"], params["sections"], params["schema"])
+            if entry is not None:
+                self._record(batch, index, self._report_result(batch, entry))
+                continue
+
+            slots.acquire()
+            self.limiter.acquire()
+            job = self.jobs.submit(get_report, flight_key=report_cache_key(params["email"], params["password"], sections=params["sections"], schema=params["schema"]), **params)
+            job["future"].add_done_callback(lambda _, job=job, index=index: self._record_job(batch, index, job, slots))
+
+    @staticmethod
+    def _report_result(batch, entry: dict) -> dict:
+        etag = entry["etag"]
+        if etag not in batch["reports"]:
+            batch["reports"][etag] = zlib.compress(app.json.dumps(entry["report"]).encode("utf-8"), COMPRESS_LEVEL)
+        return {"ok": True, "status": 200, "etag": etag}
+
+    def _record_job(self, batch, index, job, slots):
+        slots.release()
+        if job["status"] == "succeeded":
+            result = self._report_result(batch, job["result"])
+        else:
+            result = {"ok": False, "status": job["error_status"], "error": job["error"]}
+        self._record(batch, index, result)
+
+    def _record(self, batch, index, result):
+        result["index"] = index
+        with self._lock:
+            batch["results"][index] = result
+            batch["completed"] += 1
+            if batch["completed"] == batch["total"]:
+                batch["finished_at"] = time.time()
+        batch["events"].put(index)
+
+    def get(self, batch_id: str):
+        with self._lock:
+            return self._batches.get(batch_id)
+
+    def _prune(self):
+        cutoff = time.time() - self.result_ttl
+        with self._lock:
+            for batch_id in [b for b, batch in self._batches.items() if batch["finished_at"] and batch["finished_at"] < cutoff]:
+                del self._batches[batch_id]
+
+
+batch_manager = BatchManager(job_manager)
+
+
+def batch_item(batch: dict, result: dict) -> dict:
+    """A batch result as served, with its report decoded from the batch's store."""
+    if not result.get("ok"):
+        return result
+    return {**result, "report": json.loads(zlib.decompress(batch["reports"][result["etag"]]))}
+
+
+def batch_view(batch: dict, offset: int = 0, limit: int = BATCH_PAGE_SIZE) -> dict:
+    """One page of a batch's per-item results; unfinished items show as pending."""
+    page = batch["results"][offset:offset + limit]
+    next_offset = offset + limit
+    return {
+        "ok": True,
+        "batch_id": batch["id"],
+        "status": "completed" if batch["finished_at"] else "running",
+        "total": batch["total"],
+        "completed": batch["completed"],
+        "offset": offset,
+        "limit": limit,
+        "items": [batch_item(batch, r) if r is not None else {"index": offset + i, "status": "pending"} for i, r in enumerate(page)],
+        "next_offset": next_offset if next_offset < batch["total"] else None,
+    }
+
+
+# -----------------------------
+# Routes
+# -----------------------------
+def _report_params(data: dict):
+    """Validate one set of report options; returns (kwargs, None) or (None, error message)."""
     email = data.get("email")
     password = data.get("password")
     headless = data.get("headless", PLAYWRIGHT_HEADLESS)
+    max_age = data.get("max_age")
 
     if not email or not password:
-        return jsonify({"ok": False, "error": "email and password required"}), 422
+        return None, "email and password required"
+    if max_age is not None and (isinstance(max_age, bool) or not isinstance(max_age, (int, float)) or max_age < 0):
+        return None, "max_age must be a non-negative number of seconds"
+
+    # sections: list or comma-separated string of NORMALIZERS keys; None means the full report
+    sections = data.get("sections")
+    if isinstance(sections, str):
+        sections = [s.strip() for s in sections.split(",") if s.strip()]
+    if sections is not None:
+        if not isinstance(sections, list) or not sections or not all(isinstance(s, str) for s in sections):
+            return None, "sections must be a non-empty list of section names"
+        unknown = sorted(set(sections) - set(NORMALIZERS))
+        if unknown:
+            return None, f"unknown sections: {', '.join(unknown)} (choose from {', '.join(NORMALIZERS)})"
+        sections = tuple(s for s in NORMALIZERS if s in sections)
+        if len(sections) == len(NORMALIZERS):
+            sections = None
+
+    schema = data.get("schema", DEFAULT_SCHEMA)
+    if schema not in SCHEMAS:
+        return None, f"schema must be one of {', '.join(SCHEMAS)}"
+    return {
+        "email": email,
+        "password": password,
+        "headless": bool(headless),
+        "max_age": max_age,
+        "force_refresh": bool(data.get("force_refresh", False)),
+        "sections": sections,
+        "schema": schema,
+    }, None
+
+
+def _report_request():
+    """Validate a report request body; returns (kwargs, None) or (None, error response)."""
+    data = request.get_json(silent=True)
+    if not data or not isinstance(data, dict):
+        return None, (jsonify({"ok": False, "error": "Invalid JSON body"}), 400)
+
+    params, error = _report_params(data)
+    if error:
+        return None, (jsonify({"ok": False, "error": error}), 422)
+    return params, None
+
+
+def _wants_ndjson() -> bool:
+    return request.accept_mimetypes.best_match(["application/json", "application/x-ndjson"]) == "application/x-ndjson"
+
 
+def _ndjson_lines(sections, on_complete):
+    """
+    Serialize (section, value) pairs as NDJSON: one {"section", "data"} line per
+    section (accounts split into STREAM_ACCOUNT_CHUNK-sized lines), then a
+    final {"done": true} line carrying the report ETag or the error.
+    """
+    normalized = {}
     try:
-        result = fetch_report_for_credentials(email, password, headless=bool(headless))
-    except ValueError as e:
-        return jsonify({"ok": False, "error": str(e)}), 401
+        for section, value in sections:
+            normalized[section] = value
+            if section == "accounts" and value:
+                for i in range(0, len(value), STREAM_ACCOUNT_CHUNK):
+                    yield app.json.dumps({"section": section, "data": value[i:i + STREAM_ACCOUNT_CHUNK]}) + "\n"
+            else:
+                yield app.json.dumps({"section": section, "data": value}) + "\n"
+        entry = on_complete(normalized)
+        yield app.json.dumps({"done": True, "ok": True, "etag": entry["etag"]}) + "\n"
     except Exception as e:
-        return jsonify({"ok": False, "error": f"internal error: {e}"}), 500
+        yield app.json.dumps({"done": True, "ok": False, "error": f"internal error: {e}"}) + "\n"
+
+
+def _stream_report(params: dict):
+    """NDJSON response; sections are written as soon as each one is normalized."""
+    entry = cached_report(params["email"], params["password"], params["max_age"], params["force_refresh"], params["sections"], params["schema"])
+    if entry is not None:
+        sections = ((section, entry["report"][section]) for section in NORMALIZERS if section in entry["report"])
+        on_complete = lambda normalized: entry
+    else:
+        # Only the browser fetch runs on the job pool; normalization streams from here.
+        # The fetch is shared with JSON requests (and other schemas) for the same credentials.
+        # Its raw result is not kept for polling; only the normalized report is cached.
+        job = job_manager.submit(
+            fetch_report_shared, params["email"], params["password"], headless=params["headless"],
+            sections=params["sections"], flight_key=fetch_flight_key(params["email"], params["password"], params["sections"]),
+            record=False,
+        )
+        if not job_manager.wait(job, timeout=SYNC_WAIT_TIMEOUT):
+            # Hand over a report job to poll, like the JSON path; it attaches to the running fetch
+            report_job = job_manager.submit(get_report, flight_key=report_cache_key(
+                params["email"], params["password"], sections=params["sections"], schema=params["schema"]), **params)
+            return jsonify({"ok": False, "error": "report still running", "job_id": report_job["id"]}), 202
+        if job["status"] == "failed":
+            return jsonify({"ok": False, "error": job["error"]}), job["error_status"]
+        result = job["result"]
+        g.stage_timer.merge(result.get("timings", {}))
+        sections = iter_normalized_sections(result["aggregated"], result["scores"], result.get("report"), params["sections"],
+                                            params["schema"])
+        on_complete = lambda normalized: store_report(
+            params["email"], params["password"], normalized, params["sections"],
+            section_source_hashes(result["aggregated"], result["scores"]), schema=params["schema"])
+
+    return app.response_class(stream_with_context(_ndjson_lines(sections, on_complete)), mimetype="application/x-ndjson")
+
+
+def _report_response(entry: dict, base: dict = None, since: str = None):
+    """
+    200 with ETag/Age headers, or 304 when the client's If-None-Match still matches.
+    When the caller sent `since`, the body is the delta from `base` (that
+    version), or the full report under "report" with "delta": false when the
+    version is no longer known.
+    """
+    g.stage_timer.merge(entry.get("timings", {}))
+    # Checked by hand: werkzeug's make_conditional only handles GET/HEAD, and this is a POST
+    if request.if_none_match.contains_weak(entry["etag"]):
+        response = app.response_class(status=304)
+    elif since is not None:
+        with _stage("delta"):
+            if base is not None:
+                body = report_delta(base, entry)
+            else:
+                body = {"delta": False, "since": since, "etag": entry["etag"], "report": entry["report"]}
+        with _stage("serialize"):
+            response = jsonify(body)
+    else:
+        with _stage("serialize"):
+            response = jsonify(entry["report"])
+    response.set_etag(entry["etag"])
+    response.headers["Age"] = str(int(time.time() - entry["stored_at"]))
+    return response
+
+
+@app.route("/fetch_report", methods=["POST"])
+@require_api_key
+@instrument("fetch_report")
+@compress_response
+def fetch_report():
+    """Return both RAW and Normalized SmartCredit data.
+
+    With `Accept: application/x-ndjson` the report is streamed section by section.
+    `sections` (e.g. ["scores"]) limits both the upstream fetch and the output.
+    `since` (an ETag from an earlier response) returns only what changed since then;
+    it is not supported with NDJSON.
+    `schema` "v2" returns compact, typed account records (see Account); v1 is the default.
+    """
+    params, error = _report_request()
+    if error:
+        return error
+    since = request.get_json().get("since")
+    if _wants_ndjson():
+        if since is not None:
+            return jsonify({"ok": False, "error": "since is not supported with Accept: application/x-ndjson"}), 400
+        return _stream_report(params)
+
+    if since is not None and not isinstance(since, str):
+        return jsonify({"ok": False, "error": "since must be a report ETag string"}), 422
+    # Look the base version up before a refetch can push it out of the history
+    base = None
+    if since:
+        cred_key = history_key(credential_key(params["email"], params["password"]), params["schema"])
+        base = report_history.find(cred_key, since.removeprefix("W/").strip('"'))
+
+    entry = cached_report(params["email"], params["password"], params["max_age"], params["force_refresh"], params["sections"], params["schema"])
+    if entry is not None:
+        return _report_response(entry, base, since)
+
+    job = job_manager.submit(get_report, flight_key=report_cache_key(params["email"], params["password"], sections=params["sections"], schema=params["schema"]), **params)
+    if not job_manager.wait(job, timeout=SYNC_WAIT_TIMEOUT):
+        # Too slow for a synchronous answer; hand the caller the job to poll
+        return jsonify({"ok": False, "error": "report still running", "job_id": job["id"]}), 202
+
+    if job["status"] == "failed":
+        return jsonify({"ok": False, "error": job["error"]}), job["error_status"]
+    return _report_response(job["result"], base, since)
+
+
+@app.route("/jobs", methods=["POST"])
+@require_api_key
+@instrument("create_job")
+def create_job():
+    """Queue a report fetch and return its job id immediately."""
+    params, error = _report_request()
+    if error:
+        return error
 
-    normalized = normalize_report(result["aggregated"], result["scores"])
-    return jsonify(normalized), 200
+    job = job_manager.submit(get_report, flight_key=report_cache_key(params["email"], params["password"], sections=params["sections"], schema=params["schema"]), **params)
+    response = jsonify(job_view(job))
+    response.headers["Location"] = f"/jobs/{job['id']}"
+    return response, 202
+
+
+@app.route("/jobs/<job_id>", methods=["GET"])
+@require_api_key
+@instrument("get_job")
+@compress_response
+def get_job(job_id):
+    """Job status, plus the normalized report once it has succeeded."""
+    job = job_manager.get(job_id) or backfill_jobs.get(job_id)
+    if not job:
+        return jsonify({"ok": False, "error": "Unknown job"}), 404
+    response = jsonify(job_view(job))
+    if job["status"] == "succeeded" and "etag" in job["result"]:
+        response.set_etag(job["result"]["etag"])
+        return response.make_conditional(request)
+    return response, 200
+
+
+@app.route("/fetch_reports", methods=["POST"])
+@require_api_key
+@instrument("create_batch")
+def create_batch():
+    """
+    Queue reports for many users: {"items": [{email, password, ...}, ...]}.
+    Returns the batch id to page through, or streams per-item NDJSON results
+    in completion order when the client accepts application/x-ndjson.
+    """
+    data = request.get_json(silent=True)
+    items = data.get("items") if isinstance(data, dict) else None
+    if not isinstance(items, list) or not items:
+        return jsonify({"ok": False, "error": "items must be a non-empty list"}), 400
+    if len(items) > BATCH_MAX_ITEMS:
+        return jsonify({"ok": False, "error": f"at most {BATCH_MAX_ITEMS} items per batch"}), 413
+
+    # Top-level options (max_age, force_refresh, headless) are defaults for every item
+    defaults = {k: v for k, v in data.items() if k != "items"}
+    prepared = []
+    for item in items:
+        params, error = _report_params({**defaults, **item} if isinstance(item, dict) else {})
+        prepared.append({"params": params} if params else {"error": error, "error_status": 422})
+
+    batch = batch_manager.submit(prepared)
+    if _wants_ndjson():
+        def generate():
+            for _ in range(batch["total"]):
+                index = batch["events"].get()
+                yield app.json.dumps(batch_item(batch, batch["results"][index])) + "\n"
+            yield app.json.dumps({"done": True, "ok": True, "batch_id": batch["id"], "total": batch["total"]}) + "\n"
+        return app.response_class(generate(), mimetype="application/x-ndjson")
+
+    response = jsonify({"ok": True, "batch_id": batch["id"], "status": "running", "total": batch["total"]})
+    response.headers["Location"] = f"/fetch_reports/{batch['id']}"
+    return response, 202
+
+
+@app.route("/fetch_reports/<batch_id>", methods=["GET"])
+@require_api_key
+@instrument("get_batch")
+@compress_response
+def get_batch(batch_id):
+    """Page through a batch's results with ?offset=&limit=."""
+    batch = batch_manager.get(batch_id)
+    if not batch:
+        return jsonify({"ok": False, "error": "Unknown batch"}), 404
+    offset = max(0, request.args.get("offset", 0, type=int))
+    limit = min(max(1, request.args.get("limit", BATCH_PAGE_SIZE, type=int)), BATCH_MAX_ITEMS)
+    return jsonify(batch_view(batch, offset, limit)), 200
+
+
+@app.route("/renormalize", methods=["POST"])
+@require_api_key
+@instrument("renormalize")
+def renormalize_route():
+    """
+    Re-run normalization over the raw store as a job:
+    {"credentials": [credential keys], "all_versions": false, "workers": n, "schema": "v1"}, all optional.
+    """
+    if raw_store is None:
+        return jsonify({"ok": False, "error": "raw store is disabled; set RAW_STORE_DIR"}), 503
+    data = request.get_json(silent=True) or {}
+    credentials = data.get("credentials")
+    workers = data.get("workers", RENORMALIZE_WORKERS)
+    if credentials is not None and (not isinstance(credentials, list) or not all(is_sha256_hex(c) for c in credentials)):
+        return jsonify({"ok": False, "error": "credentials must be a list of credential keys (64 lowercase hex characters)"}), 422
+    if isinstance(workers, bool) or not isinstance(workers, int) or workers < 1:
+        return jsonify({"ok": False, "error": "workers must be a positive integer"}), 422
+    workers = min(workers, RENORMALIZE_WORKERS)
+    schema = data.get("schema", DEFAULT_SCHEMA)
+    if schema not in SCHEMAS:
+        return jsonify({"ok": False, "error": f"schema must be one of {', '.join(SCHEMAS)}"}), 422
+
+    # Only one backfill at a time; a second request attaches to the running one
+    job = backfill_jobs.submit(renormalize, credentials, bool(data.get("all_versions", False)), workers, schema=schema,
+                             flight_key="renormalize")
+    response = jsonify(job_view(job))
+    response.headers["Location"] = f"/jobs/{job['id']}"
+    return response, 202
+
+
+def _credential_keys_option(ctx, param, values):
+    invalid = [value for value in values if not is_sha256_hex(value)]
+    if invalid:
+        raise click.BadParameter(f"not a credential key (64 lowercase hex characters): {', '.join(invalid)}")
+    return values
+
+
+@app.cli.command("renormalize")
+@click.option("--workers", default=RENORMALIZE_WORKERS, show_default=True, help="Worker processes.")
+@click.option("--credential", "credentials", multiple=True, callback=_credential_keys_option,
+              help="Only this credential key (repeatable).")
+@click.option("--all-versions", is_flag=True, help="Every stored fetch, not just the latest per credential.")
+@click.option("--out", "out_dir", type=click.Path(file_okay=False), help="Write each report to OUT/<credential>/<manifest>.json.gz.")
+@click.option("--schema", type=click.Choice(list(SCHEMAS)), default=DEFAULT_SCHEMA, show_default=True)
+def renormalize_command(workers, credentials, all_versions, out_dir, schema):
+    """Re-run normalize_report over the raw store (RAW_STORE_DIR)."""
+    summary = renormalize(list(credentials) or None, all_versions, workers, out_dir, schema)
+    click.echo(json.dumps({"processed": summary["processed"], "failed": summary["failed"], "errors": summary["errors"]}, indent=2))
+
+
+@app.route("/metrics", methods=["GET"])
+@require_api_key
+def metrics_endpoint():
+    """Prometheus text exposition of this worker's metrics."""
+    return app.response_class(metrics.render(), mimetype="text/plain; version=0.0.4")
 
 
 @app.route("/")
 @require_api_key
 def index():
-    return jsonify({"ok": True, "msg": "SmartCredit fetch API. POST /fetch_report with {email,password}"}), 200
+    return jsonify({"ok": True, "msg": "SmartCredit fetch API. POST /fetch_report or /jobs with {email,password}"}), 200
 
 
 # -----------------------------